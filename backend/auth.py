@@ -1,5 +1,8 @@
+import threading
+import time
 from datetime import datetime, timedelta
 from typing import Optional
+from cachetools import TTLCache
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
@@ -14,6 +17,12 @@ pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 # Security scheme
 security = HTTPBearer()
 
+# Recently verified tokens -> (TokenData, expiry timestamp), so a burst of
+# requests with the same token only verifies the signature once
+TOKEN_CACHE_TTL = 60  # seconds
+_token_cache = TTLCache(maxsize=1024, ttl=TOKEN_CACHE_TTL)
+_token_cache_lock = threading.Lock()
+
 
 class Token(BaseModel):
     access_token: str
@@ -54,23 +63,43 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 
-def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)) -> TokenData:
-    """Verify JWT token from request."""
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
+def decode_token(token: str) -> Optional[TokenData]:
+    """Decode a JWT token, returning None if it is invalid or expired.
+
+    Valid tokens are cached for up to TOKEN_CACHE_TTL seconds, but never past
+    their own expiry.
+    """
+    with _token_cache_lock:
+        cached = _token_cache.get(token)
+    if cached is not None:
+        token_data, expires_at = cached
+        if expires_at > time.time():
+            return token_data
 
     try:
-        token = credentials.credentials
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        username: str = payload.get("sub")
-        if username is None:
-            raise credentials_exception
-        token_data = TokenData(username=username)
     except JWTError:
-        raise credentials_exception
+        return None
+
+    username: str = payload.get("sub")
+    if username is None:
+        return None
+
+    token_data = TokenData(username=username)
+    with _token_cache_lock:
+        _token_cache[token] = (token_data, payload.get("exp", float("inf")))
+    return token_data
+
+
+def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)) -> TokenData:
+    """Verify JWT token from request."""
+    token_data = decode_token(credentials.credentials)
+    if token_data is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
 
     return token_data
 
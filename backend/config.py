@@ -14,6 +14,10 @@ class Settings(BaseSettings):
     # Server
     HOST: str = "0.0.0.0"
     PORT: int = 8000
+    DEBUG: bool = False  # Auto-reload with a single worker when running main.py
+    # Worker processes when running main.py. Listings are cached per process, so with
+    # more than one worker the listing cache is disabled to keep them consistent
+    WORKERS: int = 1
     
     # Frontend CORS
     FRONTEND_URL: str = "http://localhost:3000"  # Default for development
@@ -23,6 +27,12 @@ class Settings(BaseSettings):
     MODELS_DIR: str = "./data/models"
     TRAJECTORIES_DIR: str = "./data/trajectories"
 
+    # Seconds that directory listings are cached in memory
+    METADATA_CACHE_TTL: int = 30
+
+    # Uploads
+    MAX_UPLOAD_SIZE: int = 512 * 1024 * 1024  # 512 MiB
+
     class Config:
         env_file = ".env"
         case_sensitive = True
@@ -1,16 +1,30 @@
-from fastapi import FastAPI, Depends, HTTPException, status, UploadFile, File, Form, Request
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, FastAPI, Depends, HTTPException, status, UploadFile, File, Form, Request
+from fastapi.responses import FileResponse, ORJSONResponse, Response, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.staticfiles import StaticFiles
+import asyncio
+import logging
+import os
+import re
+import tarfile
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from datetime import timedelta
-from typing import Optional, List
+from pathlib import Path, PurePosixPath
+from typing import Iterator, Optional, List, Tuple
+from cachetools import TTLCache
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from config import settings
 from auth import (
     authenticate_user,
     create_access_token,
+    decode_token,
     get_current_user,
     Token
 )
@@ -19,15 +33,226 @@ from models import (
     TrajectoryListResponse,
     TrajectoryUploadResponse,
     ModelListResponse,
+    ThumbnailRequest,
     ErrorResponse
 )
 from storage import storage
 
 
+logger = logging.getLogger(__name__)
+
+# Upper bound on threads used to run blocking storage (filesystem) calls
+STORAGE_MAX_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Accepted upload file extensions (compared lowercase)
+TRAJECTORY_UPLOAD_EXTENSIONS = frozenset({".npy", ".npz"})
+MODEL_UPLOAD_EXTENSIONS = frozenset({".xml"})
+
+# Media types for files served from model directories and thumbnails
+MEDIA_TYPES = {
+    ".xml": "application/xml",
+    ".stl": "model/stl",
+    ".obj": "model/mesh",
+    ".dae": "model/mesh",
+    ".mesh": "model/mesh",
+    ".png": "image/png",
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".gif": "image/gif",
+    ".webp": "image/webp",
+    ".svg": "image/svg+xml",
+}
+
+
+class LargeFileResponse(FileResponse):
+    """FileResponse that streams in 1 MiB chunks instead of Starlette's 64 KiB.
+
+    ASGI does not expose the client socket, so sendfile() cannot be called from
+    here; Starlette already hands the path to the server for zero-copy transfer
+    when it advertises the "http.response.pathsend" extension.
+    """
+    chunk_size = 1 << 20
+
+
+def is_plain_filename(filename: Optional[str]) -> bool:
+    """Check that an uploaded file name has no directory components."""
+    return bool(filename) and filename not in (".", "..") and not any(sep in filename for sep in "/\\")
+
+
+def make_etag(stat_result: os.stat_result) -> str:
+    """Build an ETag from a file's modification time and size."""
+    return f'"{int(stat_result.st_mtime)}-{stat_result.st_size:x}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Check whether the request's If-None-Match header matches etag."""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return etag in tags or "*" in tags
+
+
+async def conditional_file_response(
+    request: Request,
+    path: Path,
+    media_type: str,
+    filename: Optional[str] = None,
+    headers: Optional[dict] = None
+) -> Response:
+    """Serve a file, or a bodiless 304 if the client already has this version.
+
+    For HEAD requests FileResponse sends only the headers (including
+    Content-Length and ETag from the stat result) without opening the file.
+    """
+    stat_result = await asyncio.to_thread(os.stat, path)
+    response_headers = {**(headers or {}), "ETag": make_etag(stat_result)}
+
+    if etag_matches(request, response_headers["ETag"]):
+        return Response(status_code=304, headers=response_headers)
+
+    return LargeFileResponse(
+        path=path,
+        media_type=media_type,
+        filename=filename,
+        headers=response_headers,
+        stat_result=stat_result
+    )
+
+
+def iter_tar(members: List[Tuple[str, Path]]) -> Iterator[bytes]:
+    """Stream (archive name, path) files as an uncompressed USTAR archive."""
+    for arcname, path in members:
+        try:
+            file = open(path, "rb")
+        except FileNotFoundError:
+            continue
+
+        with file:
+            stat_result = os.fstat(file.fileno())
+            info = tarfile.TarInfo(arcname)
+            info.size = stat_result.st_size
+            info.mtime = int(stat_result.st_mtime)
+            yield info.tobuf(format=tarfile.USTAR_FORMAT)
+
+            remaining = info.size
+            while remaining > 0:
+                chunk = file.read(min(LargeFileResponse.chunk_size, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+
+        # Zero-fill if the file shrank after stat, then pad to a full block
+        yield b"\0" * (remaining + (-info.size) % tarfile.BLOCKSIZE)
+
+    # End-of-archive marker
+    yield b"\0" * (2 * tarfile.BLOCKSIZE)
+
+
+class UploadSizeLimitMiddleware:
+    """Reject POST requests whose body exceeds max_size with 413.
+
+    Runs before FastAPI parses the multipart body, so oversized uploads are
+    refused without being spooled to memory or disk. A declared Content-Length
+    is checked up front; chunked bodies are counted as they are received.
+    """
+
+    def __init__(self, app: ASGIApp, max_size: int):
+        self.app = app
+        self.max_size = max_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["method"] != "POST":
+            await self.app(scope, receive, send)
+            return
+
+        detail = f"File too large (limit is {self.max_size} bytes)"
+        content_length = Headers(scope=scope).get("content-length", "")
+        if content_length.isdigit() and int(content_length) > self.max_size:
+            response = ORJSONResponse(status_code=413, content={"detail": detail})
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_size:
+                    # FastAPI re-raises HTTPExceptions from body parsing instead of
+                    # turning them into a 400, so this becomes the 413 response
+                    raise HTTPException(status_code=413, detail=detail)
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+
+class JSONListGZipMiddleware:
+    """Gzip responses of the JSON listing endpoints only.
+
+    GZipMiddleware compresses every response over minimum_size, including file
+    downloads that are large or already compressed (npy, webp), so the listing
+    routes are selected by path before handing off to it.
+    """
+
+    def __init__(self, app: ASGIApp, path_pattern: str, **gzip_options):
+        self.app = app
+        self.gzip_app = GZipMiddleware(app, **gzip_options)
+        self.path_pattern = re.compile(path_pattern)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] == "http" and self.path_pattern.fullmatch(scope["path"]):
+            await self.gzip_app(scope, receive, send)
+        else:
+            await self.app(scope, receive, send)
+
+
+class AuthenticatedStaticFiles(StaticFiles):
+    """StaticFiles that requires the same bearer token as the API endpoints.
+
+    Serves model assets (meshes, textures, included XML) straight from Starlette
+    without going through FastAPI routing and dependency resolution per file.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        scheme, _, token = Headers(scope=scope).get("authorization", "").partition(" ")
+        if scheme.lower() != "bearer" or decode_token(token) is None:
+            response = ORJSONResponse(
+                status_code=401,
+                content={"detail": "Could not validate credentials"},
+                headers={"WWW-Authenticate": "Bearer"}
+            )
+            await response(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+
+# In-process cache for directory listings; cleared whenever files are added or removed.
+# Other workers' caches can't be cleared, so it is disabled (ttl=0) with multiple workers
+metadata_cache = TTLCache(
+    maxsize=512,
+    ttl=settings.METADATA_CACHE_TTL if settings.WORKERS == 1 else 0
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Install a bounded default executor for asyncio.to_thread()."""
+    executor = ThreadPoolExecutor(max_workers=STORAGE_MAX_WORKERS, thread_name_prefix="storage")
+    asyncio.get_running_loop().set_default_executor(executor)
+    yield
+    executor.shutdown(wait=False)
+
+
 app = FastAPI(
     title="Motion Library API",
     description="API for managing and visualizing robot motion trajectories",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # Rate limiter setup
@@ -35,6 +260,17 @@ limiter = Limiter(key_func=get_remote_address)
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
+# Reject oversized uploads before reading the body (added first so CORS headers still apply)
+app.add_middleware(UploadSizeLimitMiddleware, max_size=settings.MAX_UPLOAD_SIZE)
+
+# Compress JSON listings (trajectories, models, model files)
+app.add_middleware(
+    JSONListGZipMiddleware,
+    path_pattern=r"/api/(trajectories|models|models/[^/]+/files)",
+    minimum_size=1024,
+    compresslevel=5
+)
+
 # CORS middleware for frontend
 app.add_middleware(
     CORSMiddleware,
@@ -44,6 +280,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Model directory files (paths relative to models/, as returned by /api/models/{id}/files)
+app.mount("/api/models-static", AuthenticatedStaticFiles(directory=storage.models_dir), name="models-static")
+
 
 @app.get("/")
 async def root():
@@ -87,61 +326,71 @@ async def verify(current_user: str = Depends(get_current_user)):
     return {"valid": True, "user": current_user}
 
 
+# Trajectory, model and thumbnail endpoints all require authentication
+api_router = APIRouter(prefix="/api", dependencies=[Depends(get_current_user)])
+
+
 # Trajectory endpoints
-@app.get("/api/trajectories", response_model=TrajectoryListResponse)
+@api_router.get("/trajectories", response_model=TrajectoryListResponse)
 async def list_trajectories(
-    category: Optional[str] = None,
-    current_user: str = Depends(get_current_user)
+    category: Optional[str] = None
 ):
     """List all trajectories."""
-    trajectories = storage.list_trajectories(category=category)
-    return TrajectoryListResponse(
-        trajectories=trajectories,
-        total=len(trajectories)
-    )
+    cache_key = ("trajectories", category)
+    response = metadata_cache.get(cache_key)
+    if response is None:
+        trajectories = await asyncio.to_thread(storage.list_trajectories, category=category)
+        response = TrajectoryListResponse(
+            trajectories=trajectories,
+            total=len(trajectories)
+        )
+        metadata_cache[cache_key] = response
+    return response
 
 
-@app.get("/api/trajectories/{trajectory_id}")
+@api_router.head("/trajectories/{trajectory_id}")
+@api_router.get("/trajectories/{trajectory_id}")
 async def get_trajectory(
-    trajectory_id: str,
-    current_user: str = Depends(get_current_user)
+    request: Request,
+    trajectory_id: str
 ):
     """Download a trajectory file."""
-    file_path = storage.get_trajectory(trajectory_id)
+    file_path = await asyncio.to_thread(storage.get_trajectory, trajectory_id)
     if not file_path:
         raise HTTPException(status_code=404, detail="Trajectory not found")
 
-    return FileResponse(
-        path=file_path,
+    return await conditional_file_response(
+        request,
+        file_path,
         media_type="application/octet-stream",
         filename=file_path.name
     )
 
 
-@app.post("/api/trajectories", response_model=TrajectoryUploadResponse)
+@api_router.post("/trajectories", response_model=TrajectoryUploadResponse)
 async def upload_trajectory(
     file: UploadFile = File(...),
-    category: Optional[str] = Form(None),
-    current_user: str = Depends(get_current_user)
+    category: Optional[str] = Form(None)
 ):
     """Upload a new trajectory file."""
-    # Validate file extension
-    if not file.filename.endswith(('.npy', '.npz')):
+    # Validate file name and extension
+    if not is_plain_filename(file.filename):
+        raise HTTPException(status_code=400, detail="Invalid file name")
+    if PurePosixPath(file.filename).suffix.lower() not in TRAJECTORY_UPLOAD_EXTENSIONS:
         raise HTTPException(
             status_code=400,
             detail="Only .npy and .npz files are supported"
         )
 
-    # Read file content
-    content = await file.read()
-
     try:
-        # Save trajectory
-        trajectory = storage.save_trajectory(
+        # Stream trajectory to disk without buffering it in memory
+        trajectory = await asyncio.to_thread(
+            storage.save_trajectory,
             filename=file.filename,
-            content=content,
+            fileobj=file.file,
             category=category
         )
+        metadata_cache.clear()
 
         return TrajectoryUploadResponse(
             success=True,
@@ -155,70 +404,77 @@ async def upload_trajectory(
         )
 
 
-@app.delete("/api/trajectories/{trajectory_id}")
+@api_router.delete("/trajectories/{trajectory_id}")
 async def delete_trajectory(
-    trajectory_id: str,
-    current_user: str = Depends(get_current_user)
+    trajectory_id: str
 ):
     """Delete a trajectory file."""
-    if storage.delete_trajectory(trajectory_id):
+    if await asyncio.to_thread(storage.delete_trajectory, trajectory_id):
+        metadata_cache.clear()
         return {"success": True, "message": "Trajectory deleted successfully"}
     else:
         raise HTTPException(status_code=404, detail="Trajectory not found")
 
 
 # Model endpoints
-@app.get("/api/models", response_model=ModelListResponse)
-async def list_models(current_user: str = Depends(get_current_user)):
+@api_router.get("/models", response_model=ModelListResponse)
+async def list_models():
     """List all models."""
-    models = storage.list_models()
-    return ModelListResponse(
-        models=models,
-        total=len(models)
-    )
+    cache_key = ("models",)
+    response = metadata_cache.get(cache_key)
+    if response is None:
+        models = await asyncio.to_thread(storage.list_models)
+        response = ModelListResponse(
+            models=models,
+            total=len(models)
+        )
+        metadata_cache[cache_key] = response
+    return response
 
 
-@app.get("/api/models/{model_id}")
+@api_router.head("/models/{model_id}")
+@api_router.get("/models/{model_id}")
 async def get_model(
-    model_id: str,
-    current_user: str = Depends(get_current_user)
+    request: Request,
+    model_id: str
 ):
     """Download a model file."""
-    file_path = storage.get_model(model_id)
+    file_path = await asyncio.to_thread(storage.get_model, model_id)
     if not file_path:
         raise HTTPException(status_code=404, detail="Model not found")
 
-    return FileResponse(
-        path=file_path,
+    return await conditional_file_response(
+        request,
+        file_path,
         media_type="application/xml",
         filename=file_path.name
     )
 
 
-@app.post("/api/models")
+@api_router.post("/models")
 async def upload_model(
     file: UploadFile = File(...),
-    model_name: Optional[str] = Form(None),
-    current_user: str = Depends(get_current_user)
+    model_name: Optional[str] = Form(None)
 ):
     """Upload a new model file."""
-    # Validate file extension
-    if not file.filename.endswith('.xml'):
+    # Validate file name and extension
+    if not is_plain_filename(file.filename):
+        raise HTTPException(status_code=400, detail="Invalid file name")
+    if PurePosixPath(file.filename).suffix.lower() not in MODEL_UPLOAD_EXTENSIONS:
         raise HTTPException(
             status_code=400,
             detail="Only .xml files are supported"
         )
 
-    # Read file content
-    content = await file.read()
-
     try:
-        # Save model
-        model = storage.save_model(
+        # Stream model to disk without buffering it in memory
+        model = await asyncio.to_thread(
+            storage.save_model,
             filename=file.filename,
-            content=content,
+            fileobj=file.file,
             model_name=model_name
         )
+        metadata_cache.clear()
 
         return {
             "success": True,
@@ -232,139 +488,140 @@ async def upload_model(
         )
 
 
-@app.delete("/api/models/{model_id}")
+@api_router.delete("/models/{model_id}")
 async def delete_model(
-    model_id: str,
-    current_user: str = Depends(get_current_user)
+    model_id: str
 ):
     """Delete a model file."""
-    if storage.delete_model(model_id):
+    if await asyncio.to_thread(storage.delete_model, model_id):
+        metadata_cache.clear()
         return {"success": True, "message": "Model deleted successfully"}
     else:
         raise HTTPException(status_code=404, detail="Model not found")
 
 
-@app.get("/api/models/{model_id}/files")
+@api_router.get("/models/{model_id}/files")
 async def list_model_files(
-    model_id: str,
-    current_user: str = Depends(get_current_user)
+    model_id: str
 ):
     """List all files in a model's directory."""
-    files = storage.get_model_directory_files(model_id)
+    cache_key = ("model_files", model_id)
+    files = metadata_cache.get(cache_key)
+    if files is None:
+        files = await asyncio.to_thread(storage.get_model_directory_files, model_id)
+        metadata_cache[cache_key] = files
     if not files:
         raise HTTPException(status_code=404, detail="Model not found")
     return {"files": files}
 
 
-@app.get("/api/models/{model_id}/files/{file_path:path}")
+@api_router.head("/models/{model_id}/files/{file_path:path}")
+@api_router.get("/models/{model_id}/files/{file_path:path}")
 async def get_model_file(
+    request: Request,
     model_id: str,
-    file_path: str,
-    current_user: str = Depends(get_current_user)
+    file_path: str
 ):
     """Get a specific file from a model's directory."""
-    file_abs_path = storage.get_file_in_model_directory(model_id, file_path)
+    file_abs_path = await asyncio.to_thread(storage.get_file_in_model_directory, model_id, file_path)
     if not file_abs_path:
         raise HTTPException(status_code=404, detail="File not found in model directory")
 
     # Determine media type based on file extension
-    media_type = "application/octet-stream"
-    suffix = file_abs_path.suffix.lower()
-    
-    if suffix == '.xml':
-        media_type = "application/xml"
-    elif suffix == '.stl':
-        media_type = "model/stl"
-    elif suffix in ['.obj', '.dae', '.mesh']:
-        media_type = "model/mesh"
-    elif suffix == '.png':
-        media_type = "image/png"
-    elif suffix in ['.jpg', '.jpeg']:
-        media_type = "image/jpeg"
-    elif suffix == '.gif':
-        media_type = "image/gif"
-    elif suffix == '.webp':
-        media_type = "image/webp"
-    elif suffix == '.svg':
-        media_type = "image/svg+xml"
-
-    return FileResponse(
-        path=file_abs_path,
+    media_type = MEDIA_TYPES.get(file_abs_path.suffix.lower(), "application/octet-stream")
+
+    return await conditional_file_response(
+        request,
+        file_abs_path,
         media_type=media_type,
         filename=file_abs_path.name
     )
 
 
 # Thumbnail endpoints
-@app.get("/api/models/{model_id}/thumbnail")
+@api_router.head("/models/{model_id}/thumbnail")
+@api_router.get("/models/{model_id}/thumbnail")
 async def get_model_thumbnail(
-    model_id: str,
-    current_user: str = Depends(get_current_user)
+    request: Request,
+    model_id: str
 ):
     """Get thumbnail image for a model."""
-    print(f"[THUMBNAIL] Model thumbnail request: model_id={model_id}")
-    thumbnail_path = storage.get_model_thumbnail(model_id)
+    logger.debug("Model thumbnail request: model_id=%s", model_id)
+    thumbnail_path = await asyncio.to_thread(storage.get_model_thumbnail, model_id)
     if not thumbnail_path:
-        print(f"[THUMBNAIL] Model thumbnail not found for id={model_id}")
+        logger.debug("Model thumbnail not found for id=%s", model_id)
         raise HTTPException(status_code=404, detail="Thumbnail not found")
 
-    print(f"[THUMBNAIL] Model thumbnail found: {thumbnail_path}")
+    logger.debug("Model thumbnail found: %s", thumbnail_path)
 
     # Determine media type based on extension
-    media_type = "image/webp"
-    if thumbnail_path.suffix == ".png":
-        media_type = "image/png"
-    elif thumbnail_path.suffix == ".jpg":
-        media_type = "image/jpeg"
-    elif thumbnail_path.suffix == ".gif":
-        media_type = "image/gif"
-
-    print(f"[THUMBNAIL] Serving with media_type={media_type}")
-
-    return FileResponse(
-        path=thumbnail_path,
+    media_type = MEDIA_TYPES.get(thumbnail_path.suffix.lower(), "image/webp")
+
+    logger.debug("Serving thumbnail with media_type=%s", media_type)
+
+    return await conditional_file_response(
+        request,
+        thumbnail_path,
         media_type=media_type,
         headers={"Cache-Control": "public, max-age=3600"}
     )
 
 
-@app.get("/api/trajectories/{trajectory_id}/thumbnail")
+@api_router.head("/trajectories/{trajectory_id}/thumbnail")
+@api_router.get("/trajectories/{trajectory_id}/thumbnail")
 async def get_trajectory_thumbnail(
-    trajectory_id: str,
-    current_user: str = Depends(get_current_user)
+    request: Request,
+    trajectory_id: str
 ):
     """Get thumbnail animation for a trajectory."""
-    print(f"[THUMBNAIL] Trajectory thumbnail request: trajectory_id={trajectory_id}")
-    thumbnail_path = storage.get_trajectory_thumbnail(trajectory_id)
+    logger.debug("Trajectory thumbnail request: trajectory_id=%s", trajectory_id)
+    thumbnail_path = await asyncio.to_thread(storage.get_trajectory_thumbnail, trajectory_id)
     if not thumbnail_path:
-        print(f"[THUMBNAIL] Trajectory thumbnail not found for id={trajectory_id}")
+        logger.debug("Trajectory thumbnail not found for id=%s", trajectory_id)
         raise HTTPException(status_code=404, detail="Thumbnail not found")
 
-    print(f"[THUMBNAIL] Trajectory thumbnail found: {thumbnail_path}")
+    logger.debug("Trajectory thumbnail found: %s", thumbnail_path)
 
     # Determine media type based on extension
-    media_type = "image/webp"
-    if thumbnail_path.suffix == ".gif":
-        media_type = "image/gif"
-    elif thumbnail_path.suffix == ".png":
-        media_type = "image/png"
-    elif thumbnail_path.suffix == ".jpg":
-        media_type = "image/jpeg"
-
-    print(f"[THUMBNAIL] Serving with media_type={media_type}")
-
-    return FileResponse(
-        path=thumbnail_path,
+    media_type = MEDIA_TYPES.get(thumbnail_path.suffix.lower(), "image/webp")
+
+    logger.debug("Serving thumbnail with media_type=%s", media_type)
+
+    return await conditional_file_response(
+        request,
+        thumbnail_path,
         media_type=media_type,
         headers={"Cache-Control": "public, max-age=3600"}
     )
 
 
+@api_router.post("/thumbnails:batch")
+async def get_thumbnails_batch(items: List[ThumbnailRequest]):
+    """Get several thumbnails in one tar archive.
+
+    Members are named "{type}/{id}{ext}" (e.g. "trajectory/abc123.webp");
+    items without a thumbnail are left out.
+    """
+    members = []
+    for item_type, directory in (("model", "models"), ("trajectory", "trajectories")):
+        item_ids = [item.id for item in items if item.type == item_type]
+        if item_ids:
+            paths = await asyncio.to_thread(storage.find_thumbnails, directory, item_ids)
+            members.extend((f"{item_type}/{item_id}{path.suffix}", path) for item_id, path in paths.items())
+
+    return StreamingResponse(iter_tar(members), media_type="application/x-tar")
+
+
+app.include_router(api_router)
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
         "main:app",
         host=settings.HOST,
         port=settings.PORT,
-        reload=True
+        reload=settings.DEBUG,
+        # reload only works with a single worker
+        workers=1 if settings.DEBUG else settings.WORKERS
     )
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional, List
+from typing import Literal, Optional, List
 from datetime import datetime
 
 
@@ -45,5 +45,10 @@ class ModelListResponse(BaseModel):
     total: int
 
 
+class ThumbnailRequest(BaseModel):
+    type: Literal["model", "trajectory"]
+    id: str
+
+
 class ErrorResponse(BaseModel):
     detail: str
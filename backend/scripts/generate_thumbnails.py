@@ -21,15 +21,53 @@ Usage:
 """
 
 import argparse
+import functools
 import hashlib
+import json
+import multiprocessing
+import os
+import socket
+import socketserver
+import sys
+from collections import OrderedDict
 from pathlib import Path
-from typing import Tuple
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
 import numpy as np
-import mujoco
-from PIL import Image
+
+# MuJoCo only accepts egl/osmesa on Linux and raises on import elsewhere
+GL_BACKENDS = ("egl", "glfw", "osmesa") if sys.platform.startswith("linux") else ("glfw",)
+
+
+def select_gl_backend(argv: list) -> Optional[str]:
+    """Set MUJOCO_GL from --gl-backend (default on Linux: EGL GPU rendering)
+
+    MuJoCo reads MUJOCO_GL when it is imported, so this runs before `import mujoco`.
+    Without it, headless Linux machines silently fall back to slow OSMesa software
+    rendering. Other platforms keep MuJoCo's own default.
+    """
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("--gl-backend", choices=GL_BACKENDS, default=None)
+    args, _ = parser.parse_known_args(argv)
+
+    if args.gl_backend:
+        os.environ["MUJOCO_GL"] = args.gl_backend
+    elif sys.platform.startswith("linux"):
+        os.environ.setdefault("MUJOCO_GL", "egl")
+    if os.environ.get("MUJOCO_GL") == "egl":
+        os.environ.setdefault("MUJOCO_EGL_DEVICE_ID", "0")
+    return os.environ.get("MUJOCO_GL")
+
+
+select_gl_backend(sys.argv[1:])
+
+import mujoco  # noqa: E402  (must follow select_gl_backend)
+from PIL import Image  # noqa: E402
 
 # Configuration
-THUMBNAIL_SIZE = (320, 320)  # Small web-optimized size
+# Thumbnails are rendered directly at their final square size (never downscaled)
+MODEL_THUMBNAIL_SIZE = 320  # Small web-optimized size
+TRAJECTORY_THUMBNAIL_SIZE = 240  # Animations trade resolution for file size and render time
 
 # Default camera settings (programmatic camera, doesn't use XML camera definitions)
 DEFAULT_CAMERA_DISTANCE = 3.0  # Distance from model
@@ -41,10 +79,146 @@ DEFAULT_CAMERA_LOOKAT = [0, 0, 1]  # Point to look at [x, y, z]
 TRAJECTORY_FRAMES = 30  # Number of frames in animation
 ANIMATION_DURATION = 100  # ms per frame (10 fps)
 
+# File types, matched case-insensitively like the backend's listings
+MODEL_EXTENSION = ".xml"
+TRAJECTORY_EXTENSIONS = (".npy", ".npz")
+
+# Worker processes for rendering many trajectories
+DEFAULT_JOBS = max(1, (os.cpu_count() or 2) // 2)
+
+# Default WebP encoder settings (method: 0 = fastest ... 6 = smallest; 4 is libwebp's default).
+# Lossy quality 75 is visually indistinguishable at thumbnail sizes and encodes faster
+WEBP_QUALITY = 75
+WEBP_METHOD = 4
+
+# Render daemon settings
+DAEMON_SOCKET_PATH = "/tmp/thumbgen.sock"
+DAEMON_MAX_RENDERERS = 8  # Renderers (GL contexts) kept alive, one per (model, size)
+
+# Sidecar next to each thumbnail holding the signature of the inputs it was rendered from
+SIGNATURE_SUFFIX = ".sig"
+
+
+def save_webp_image(
+    pixels: np.ndarray,
+    output_path: Path,
+    quality: int = WEBP_QUALITY,
+    method: int = WEBP_METHOD
+):
+    """Encode one (height, width, 3) uint8 RGB frame as a still WebP"""
+    Image.fromarray(pixels).save(output_path, "WEBP", quality=quality, method=method)
+
+
+def save_webp_animation(
+    frames: np.ndarray,
+    output_path: Path,
+    duration: int = ANIMATION_DURATION,
+    quality: int = WEBP_QUALITY,
+    method: int = WEBP_METHOD,
+    minimize_size: bool = False
+):
+    """Encode (N, height, width, 3) uint8 RGB frames as a looping animated WebP
+
+    Pillow (>= 11.3) hands the frames straight to libwebp's WebPAnimEncoder, so the
+    encode itself runs in C; the cost that matters is `method`, not the wrapper.
+    minimize_size makes the encoder try harder on inter-frame packing (slow).
+    Pillow stores RGB as 4 bytes/pixel, so Image.fromarray copies each frame once;
+    there is no zero-copy path for RGB.
+    """
+    pil_frames = [Image.fromarray(frame) for frame in frames]
+    pil_frames[0].save(
+        output_path,
+        "WEBP",
+        save_all=True,
+        append_images=pil_frames[1:],
+        duration=duration,
+        loop=0,  # Infinite loop
+        quality=quality,
+        method=method,
+        minimize_size=minimize_size
+    )
+
+
+def find_files(directory: Path, extensions: Tuple[str, ...], pattern: str = "*") -> List[Path]:
+    """Find files matching a glob pattern whose extension is one of extensions
+
+    Extensions must be lowercase; file names are matched case-insensitively, so
+    uploads like WALK.NPY or Robot.XML (which the backend lists) get thumbnails too.
+    """
+    return sorted(
+        path for path in directory.glob(pattern)
+        if path.suffix.lower() in extensions and path.is_file()
+    )
+
+
+@functools.lru_cache(maxsize=4096)
+def get_file_id(relative_path: str) -> str:
+    """MD5-based file ID, cached per path
+
+    MD5 is kept (rather than a faster non-crypto hash) because the IDs must match
+    the ones storage.py serves thumbnails under.
+    """
+    return hashlib.md5(relative_path.encode()).hexdigest()[:16]
+
+
+@functools.lru_cache(maxsize=8)
+def _load_model(xml_path: str) -> mujoco.MjModel:
+    """Compile an MJCF model once per process and reuse it
+
+    Parsing the XML and compiling meshes dominates the cost of a thumbnail for large
+    models. Callers must treat the returned model as read-only and create their own
+    MjData. Assumes the XML (and its assets) don't change on disk during a run.
+    """
+    return mujoco.MjModel.from_xml_path(xml_path)
+
+
+def file_digest(path: Path) -> bytes:
+    """BLAKE2b digest of a file's contents, read in 1 MiB chunks"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.digest()
+
+
+def render_signature(*parts) -> str:
+    """Signature of everything a thumbnail is rendered from
+
+    Args:
+        parts: File digests (bytes) and JSON-serializable render settings
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(part if isinstance(part, bytes) else json.dumps(part, sort_keys=True).encode())
+    return digest.hexdigest()
+
 
 class ThumbnailGenerator:
-    def __init__(self, data_dir: Path):
+    def __init__(
+        self,
+        data_dir: Path,
+        size: int = None,
+        force: bool = False,
+        webp_quality: int = WEBP_QUALITY,
+        webp_method: int = WEBP_METHOD,
+        optimize_size: bool = False
+    ):
+        """
+        Args:
+            data_dir: Data directory containing models/, trajectories/ and thumbnails/
+            size: Square thumbnail size in pixels (default: MODEL_THUMBNAIL_SIZE for
+                  models, TRAJECTORY_THUMBNAIL_SIZE for trajectories)
+            force: Re-render even if a thumbnail's signature shows it is up to date
+            webp_quality: Lossy WebP quality (0-100)
+            webp_method: WebP encoder effort (0 = fastest ... 6 = smallest)
+            optimize_size: Minimize animated WebP size at the cost of a much slower encode
+        """
         self.data_dir = data_dir
+        self.size = size
+        self.force = force
+        self.webp_quality = webp_quality
+        self.webp_method = webp_method
+        self.optimize_size = optimize_size
         self.models_dir = data_dir / "models"
         self.trajectories_dir = data_dir / "trajectories"
         self.thumbnails_dir = data_dir / "thumbnails"
@@ -60,66 +234,157 @@ class ThumbnailGenerator:
             relative_path: Path relative to models/ or trajectories/ directory
                           e.g., "MS-Human-700/MS-Human-700-MJX.xml"
         """
-        return hashlib.md5(relative_path.encode()).hexdigest()[:16]
+        return get_file_id(relative_path)
+
+    def is_up_to_date(self, output_path: Path, signature: Optional[str]) -> bool:
+        """Check whether output_path was rendered from inputs matching signature
+
+        Model XML and trajectory bytes are hashed, not mesh/texture assets the XML
+        references; use --force after changing only those.
+        """
+        if self.force or signature is None or not output_path.exists():
+            return False
+
+        try:
+            return output_path.with_name(output_path.name + SIGNATURE_SUFFIX).read_text() == signature
+        except OSError:
+            return False
+
+    def write_signature(self, output_path: Path, signature: Optional[str]):
+        """Record the signature of a freshly rendered thumbnail (after the image is written)"""
+        if signature is not None:
+            output_path.with_name(output_path.name + SIGNATURE_SUFFIX).write_text(signature)
+
+    def trajectory_output_path(self, trajectory_path: Path) -> Tuple[str, str, Path]:
+        """Resolve where a trajectory's animation goes
+
+        Returns:
+            Tuple of (path relative to trajectories/, trajectory ID, output WebP path)
+        """
+        # Get relative path from trajectories directory for ID generation
+        rel_path = trajectory_path.relative_to(self.trajectories_dir)
+        rel_path_str = str(rel_path)  # e.g., "locomotion/walk.npy"
+
+        trajectory_id = self.get_file_id(rel_path_str)
+
+        # Create thumbnail path mirroring the trajectory directory structure
+        # e.g., data/thumbnails/trajectories/locomotion/xyz789.webp
+        thumbnail_subdir = self.thumbnails_dir / "trajectories" / rel_path.parent
+        thumbnail_subdir.mkdir(parents=True, exist_ok=True)
+        return (rel_path_str, trajectory_id, thumbnail_subdir / f"{trajectory_id}.webp")
+
+    def stale_trajectories(
+        self,
+        trajectory_files: List[Path],
+        model_relative_path: str,
+        camera_args: tuple
+    ) -> List[Tuple[Path, Optional[str]]]:
+        """Filter out trajectories whose animation is already up to date
+
+        Args:
+            trajectory_files: Absolute paths to trajectory files
+            model_relative_path: Path relative to models/ directory
+            camera_args: (camera_name, distance, azimuth, elevation, lookat)
+
+        Returns:
+            List of (trajectory_path, signature) to render; signature is None if it
+            couldn't be computed (the render then reports the underlying error)
+        """
+        model_path = self.models_dir / model_relative_path
+        try:
+            model_digest = file_digest(model_path)
+        except OSError:
+            return [(trajectory_file, None) for trajectory_file in trajectory_files]
+
+        settings = {
+            "camera": camera_args,
+            "size": self.size or TRAJECTORY_THUMBNAIL_SIZE,
+            "frames": TRAJECTORY_FRAMES,
+            "duration": ANIMATION_DURATION,
+            "quality": self.webp_quality,
+            "method": self.webp_method,
+            "minimize_size": self.optimize_size,
+        }
+
+        stale = []
+        for trajectory_file in trajectory_files:
+            try:
+                signature = render_signature(model_digest, file_digest(trajectory_file), settings)
+                rel_path_str, _, output_path = self.trajectory_output_path(trajectory_file)
+            except (OSError, ValueError):
+                stale.append((trajectory_file, None))
+                continue
+
+            if self.is_up_to_date(output_path, signature):
+                print(f"Up to date, skipping: {rel_path_str}")
+            else:
+                stale.append((trajectory_file, signature))
+
+        return stale
 
-    def render_with_camera(
+    def build_camera(
         self,
         model: mujoco.MjModel,
-        data: mujoco.MjData,
         camera_name: str = None,
         distance: float = None,
         azimuth: float = None,
         elevation: float = None,
         lookat: list = None
-    ) -> np.ndarray:
-        """Render a frame with the specified camera configuration
+    ):
+        """Build the camera to render with
 
         Args:
             model: MuJoCo model
-            data: MuJoCo data
             camera_name: Name of camera defined in XML (if None, uses custom parameters)
             distance: Camera distance (used if camera_name is None)
             azimuth: Camera azimuth angle (used if camera_name is None)
             elevation: Camera elevation angle (used if camera_name is None)
             lookat: Camera lookat point (used if camera_name is None)
-        """
-        # Create offscreen renderer
-        renderer = mujoco.Renderer(model, THUMBNAIL_SIZE[1], THUMBNAIL_SIZE[0])
 
+        Returns:
+            Camera ID of the XML camera, or a free MjvCamera with the custom parameters
+        """
         if camera_name:
             # Use camera defined in XML
             try:
                 camera_id = model.camera(camera_name).id
                 print(f"  Using XML camera: {camera_name} (id={camera_id})")
-                renderer.update_scene(data, camera=camera_id)
+                return camera_id
             except KeyError:
                 print(f"  Warning: Camera '{camera_name}' not found in model, using custom parameters")
                 # Fall back to custom parameters
-                camera_name = None
 
-        if not camera_name:
-            # Set up camera programmatically with custom parameters
-            camera = mujoco.MjvCamera()
-            mujoco.mjv_defaultFreeCamera(model, camera)
+        # Set up camera programmatically with custom parameters
+        camera = mujoco.MjvCamera()
+        mujoco.mjv_defaultFreeCamera(model, camera)
 
-            # Use provided parameters or defaults
-            camera.distance = distance if distance is not None else DEFAULT_CAMERA_DISTANCE
-            camera.azimuth = azimuth if azimuth is not None else DEFAULT_CAMERA_AZIMUTH
-            camera.elevation = elevation if elevation is not None else DEFAULT_CAMERA_ELEVATION
-            camera.lookat[:] = lookat if lookat is not None else DEFAULT_CAMERA_LOOKAT
+        # Use provided parameters or defaults
+        camera.distance = distance if distance is not None else DEFAULT_CAMERA_DISTANCE
+        camera.azimuth = azimuth if azimuth is not None else DEFAULT_CAMERA_AZIMUTH
+        camera.elevation = elevation if elevation is not None else DEFAULT_CAMERA_ELEVATION
+        camera.lookat[:] = lookat if lookat is not None else DEFAULT_CAMERA_LOOKAT
 
-            print(f"  Using custom camera: distance={camera.distance}, azimuth={camera.azimuth}, elevation={camera.elevation}")
+        print(f"  Using custom camera: distance={camera.distance}, azimuth={camera.azimuth}, elevation={camera.elevation}")
 
-            # Update scene with custom camera
-            renderer.update_scene(data, camera=camera)
+        return camera
 
-        # Render
-        pixels = renderer.render()
-
-        # Clean up
-        renderer.close()
+    def render_frame(
+        self,
+        renderer: mujoco.Renderer,
+        data: mujoco.MjData,
+        camera,
+        out: np.ndarray = None
+    ) -> np.ndarray:
+        """Render a frame of the current state with an existing renderer and camera
 
-        return pixels
+        Args:
+            renderer: Offscreen renderer, created once and reused across frames
+            data: MuJoCo data (qpos already set and forwarded)
+            camera: Camera returned by build_camera
+            out: Optional (height, width, 3) uint8 buffer to render into instead of allocating
+        """
+        renderer.update_scene(data, camera=camera)
+        return renderer.render(out=out)
 
     def render_model(
         self,
@@ -151,7 +416,7 @@ class ThumbnailGenerator:
             print(f"Error: Model not found at {model_path}")
             return False
 
-        if not model_path.suffix == '.xml':
+        if not model_path.suffix.lower() == MODEL_EXTENSION:
             print(f"Error: File is not an XML file: {model_path}")
             return False
 
@@ -160,30 +425,28 @@ class ThumbnailGenerator:
             rel_path_str = model_relative_path  # Already relative to models/
 
             model_id = self.get_file_id(rel_path_str)
+            output_path = self.model_output_path(model_relative_path)
 
-            # Create thumbnail path mirroring the model directory structure
-            # e.g., data/thumbnails/models/MS-Human-700/abc123.webp
-            rel_path = Path(model_relative_path)
-            thumbnail_subdir = self.thumbnails_dir / "models" / rel_path.parent
-            thumbnail_subdir.mkdir(parents=True, exist_ok=True)
-            output_path = thumbnail_subdir / f"{model_id}.webp"
+            signature = self.model_signature(model_relative_path, (camera_name, distance, azimuth, elevation, lookat))
+            if self.is_up_to_date(output_path, signature):
+                print(f"Up to date, skipping: {rel_path_str}")
+                return True
 
             print(f"Rendering model: {rel_path_str}")
             print(f"  Model ID: {model_id}")
 
             # Load model
-            model = mujoco.MjModel.from_xml_path(str(model_path))
+            model = _load_model(str(model_path))
             data = mujoco.MjData(model)
 
-            # Reset to initial state
-            mujoco.mj_forward(model, data)
-
             # Render frame with camera
-            pixels = self.render_with_camera(model, data, camera_name, distance, azimuth, elevation, lookat)
-
-            # Save as WebP with compression
-            img = Image.fromarray(pixels)
-            img.save(output_path, "WEBP", quality=85, method=6)
+            size = self.size or MODEL_THUMBNAIL_SIZE
+            renderer = mujoco.Renderer(model, size, size)
+            try:
+                camera = self.build_camera(model, camera_name, distance, azimuth, elevation, lookat)
+                self._render_model_with_ctx(model, data, renderer, camera, output_path, signature)
+            finally:
+                renderer.close()
 
             print(f"Saved to {output_path}")
             return True
@@ -192,6 +455,82 @@ class ThumbnailGenerator:
             print(f"Error: {e}")
             return False
 
+    def model_output_path(self, model_relative_path: str) -> Path:
+        """Resolve where a model's thumbnail goes, mirroring the model directory structure
+
+        e.g., data/thumbnails/models/MS-Human-700/abc123.webp
+        """
+        thumbnail_subdir = self.thumbnails_dir / "models" / Path(model_relative_path).parent
+        thumbnail_subdir.mkdir(parents=True, exist_ok=True)
+        return thumbnail_subdir / f"{self.get_file_id(model_relative_path)}.webp"
+
+    def model_signature(self, model_relative_path: str, camera_args: tuple) -> str:
+        """Signature of the inputs a model thumbnail is rendered from (see is_up_to_date)"""
+        return render_signature(file_digest(self.models_dir / model_relative_path), {
+            "camera": camera_args,
+            "size": self.size or MODEL_THUMBNAIL_SIZE,
+            "quality": self.webp_quality,
+            "method": self.webp_method,
+        })
+
+    def _render_model_with_ctx(
+        self,
+        model: mujoco.MjModel,
+        data: mujoco.MjData,
+        renderer: mujoco.Renderer,
+        camera,
+        output_path: Path,
+        signature: str = None
+    ):
+        """Render a model in its initial pose and save it as a still WebP"""
+        # Reset to initial state
+        mujoco.mj_resetData(model, data)
+        mujoco.mj_forward(model, data)
+
+        # Save as WebP with compression
+        save_webp_image(self.render_frame(renderer, data, camera), output_path, self.webp_quality, self.webp_method)
+        self.write_signature(output_path, signature)
+
+    def load_render_context(
+        self,
+        model_relative_path: str,
+        camera_name: str = None,
+        distance: float = None,
+        azimuth: float = None,
+        elevation: float = None,
+        lookat: list = None
+    ) -> Optional[Tuple[mujoco.MjModel, mujoco.MjData, mujoco.Renderer, object]]:
+        """Load model, data, renderer and camera once, for rendering many trajectories
+
+        Compiling the MJCF and uploading meshes/textures to the GL context dominates the
+        cost of a thumbnail for large models, so callers reuse the context across files.
+        The caller owns the returned renderer and must close() it.
+
+        Returns:
+            Tuple of (model, data, renderer, camera), or None if the model path is invalid
+        """
+        model_path = self.models_dir / model_relative_path
+
+        if not model_path.exists():
+            print(f"Error: Model not found at {model_path}")
+            return None
+
+        if not model_path.suffix.lower() == MODEL_EXTENSION:
+            print(f"Error: Model file is not an XML file: {model_path}")
+            return None
+
+        model = _load_model(str(model_path))
+        data = mujoco.MjData(model)
+        size = self.size or TRAJECTORY_THUMBNAIL_SIZE
+        renderer = mujoco.Renderer(model, size, size)
+        try:
+            camera = self.build_camera(model, camera_name, distance, azimuth, elevation, lookat)
+        except Exception:
+            renderer.close()
+            raise
+
+        return (model, data, renderer, camera)
+
     def render_trajectory(
         self,
         trajectory_path: Path,
@@ -216,77 +555,115 @@ class ThumbnailGenerator:
         Returns:
             True if successful, False otherwise
         """
+        camera_args = (camera_name, distance, azimuth, elevation, lookat)
+        stale = self.stale_trajectories([trajectory_path], model_relative_path, camera_args)
+        if not stale:
+            return True
+        _, signature = stale[0]
 
-        model_path = self.models_dir / model_relative_path
-
-        if not model_path.exists():
-            print(f"Error: Model not found at {model_path}")
+        try:
+            ctx = self.load_render_context(model_relative_path, *camera_args)
+        except Exception as e:
+            print(f"Error: {e}")
             return False
 
-        if not model_path.suffix == '.xml':
-            print(f"Error: Model file is not an XML file: {model_path}")
+        if ctx is None:
             return False
 
+        model, data, renderer, camera = ctx
         try:
-            # Get relative path from trajectories directory for ID generation
-            rel_path = trajectory_path.relative_to(self.trajectories_dir)
-            rel_path_str = str(rel_path)  # e.g., "locomotion/walk.npy"
+            return self._render_trajectory_with_ctx(
+                model, data, renderer, camera, trajectory_path, model_relative_path, signature
+            )
+        finally:
+            renderer.close()
 
-            trajectory_id = self.get_file_id(rel_path_str)
+    def _render_trajectory_with_ctx(
+        self,
+        model: mujoco.MjModel,
+        data: mujoco.MjData,
+        renderer: mujoco.Renderer,
+        camera,
+        trajectory_path: Path,
+        model_relative_path: str,
+        signature: str = None
+    ) -> bool:
+        """Render animated WebP for a single trajectory with a preloaded render context
 
-            # Create thumbnail path mirroring the trajectory directory structure
-            # e.g., data/thumbnails/trajectories/locomotion/xyz789.webp
-            thumbnail_subdir = self.thumbnails_dir / "trajectories" / rel_path.parent
-            thumbnail_subdir.mkdir(parents=True, exist_ok=True)
-            output_path = thumbnail_subdir / f"{trajectory_id}.webp"
+        Args:
+            model, data, renderer, camera: Context returned by load_render_context
+            trajectory_path: Absolute path to trajectory file
+            model_relative_path: Path relative to models/ directory (for logging only)
+            signature: Input signature to record next to the output (see stale_trajectories)
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            rel_path_str, trajectory_id, output_path = self.trajectory_output_path(trajectory_path)
 
             print(f"Rendering trajectory: {rel_path_str}")
             print(f"  Trajectory ID: {trajectory_id}")
             print(f"  Using model: {model_relative_path}")
 
-            # Load model
-            model = mujoco.MjModel.from_xml_path(str(model_path))
-            data = mujoco.MjData(model)
+            # Start from a clean state; data is shared with the previous trajectory
+            mujoco.mj_resetData(model, data)
 
-            # Load trajectory data
-            trajectory_data = np.load(trajectory_path)
+            # Load trajectory data. NPY files are memory-mapped so only the sampled rows
+            # below are read from disk; NPZ members are compressed and can't be mapped,
+            # so qpos_traj is read once and the archive closed straight away
+            trajectory_data = np.load(trajectory_path, mmap_mode='r')
             if isinstance(trajectory_data, np.lib.npyio.NpzFile):
                 # NPZ file - get qpos array
-                qpos_data = trajectory_data['qpos_traj']
+                with trajectory_data:
+                    qpos_data = trajectory_data['qpos_traj']
             else:
-                # NPY file
+                # NPY file (memory-mapped)
                 qpos_data = trajectory_data
 
-            total_frames = len(qpos_data)
-
-            # Sample frames evenly across trajectory
-            frame_indices = np.linspace(0, total_frames - 1, TRAJECTORY_FRAMES, dtype=int)
+            # Validate the shape once up front (cheap even when memory-mapped), instead of
+            # letting every per-frame assignment broadcast or fail
+            if qpos_data.ndim != 2 or qpos_data.shape[1] != model.nq:
+                raise ValueError(f"qpos shape {qpos_data.shape} doesn't match model (expected (frames, {model.nq}))")
 
-            # Render frames
-            frames = []
-            for idx in frame_indices:
-                # Set qpos from trajectory
-                data.qpos[:] = qpos_data[idx]
-                mujoco.mj_forward(model, data)
+            total_frames = len(qpos_data)
+            if total_frames == 0:
+                raise ValueError("Trajectory has no frames")
+
+            # Sample frames evenly across trajectory (rounded, not truncated toward the start).
+            # Trajectories shorter than TRAJECTORY_FRAMES would repeat poses, so drop
+            # duplicates and stretch each frame to keep the same total playback time
+            frame_indices = np.unique(np.rint(np.linspace(0, total_frames - 1, TRAJECTORY_FRAMES)).astype(np.intp))
+            frame_duration = round(TRAJECTORY_FRAMES * ANIMATION_DURATION / len(frame_indices))
+
+            # Gather the sampled poses into one contiguous float64 block up front, so each
+            # row copy into MjData below is a plain same-dtype memcpy
+            sampled_qpos = np.ascontiguousarray(qpos_data[frame_indices], dtype=np.float64)
+            del qpos_data, trajectory_data  # Release the mapping / full NPZ array
+
+            # Render frames straight into a preallocated buffer, reusing one
+            # renderer (GL context) and camera for all of them
+            frames = np.empty((len(sampled_qpos), renderer.height, renderer.width, 3), dtype=np.uint8)
+            for i, qpos in enumerate(sampled_qpos):
+                # Set qpos from trajectory. Rendering only needs position-dependent
+                # quantities (kinematics, cameras/lights, tendons, flex), so skip the
+                # velocity/actuation/constraint-solver stages of a full mj_forward
+                np.copyto(data.qpos, qpos, casting='no')
+                mujoco.mj_fwdPosition(model, data)
 
                 # Render frame with camera
-                pixels = self.render_with_camera(model, data, camera_name, distance, azimuth, elevation, lookat)
-                frames.append(pixels)
-
-            # Save as WebP animation with compression
-            pil_frames = [Image.fromarray(frame) for frame in frames]
+                self.render_frame(renderer, data, camera, out=frames[i])
 
             # Save as animated WebP
-            pil_frames[0].save(
+            save_webp_animation(
+                frames,
                 output_path,
-                "WEBP",
-                save_all=True,
-                append_images=pil_frames[1:],
-                duration=ANIMATION_DURATION,
-                loop=0,  # Infinite loop
-                quality=85,
-                method=6
+                frame_duration,
+                self.webp_quality,
+                self.webp_method,
+                self.optimize_size
             )
+            self.write_signature(output_path, signature)
 
             print(f"Saved to {output_path}")
             return True
@@ -303,10 +680,15 @@ class ThumbnailGenerator:
         distance: float = None,
         azimuth: float = None,
         elevation: float = None,
-        lookat: list = None
+        lookat: list = None,
+        jobs: int = 1,
+        egl_devices: List[str] = None
     ) -> Tuple[int, int]:
         """Render all trajectories in a folder
 
+        The model, renderer and camera are loaded once (once per worker process when
+        jobs > 1) and reused for every trajectory in the folder.
+
         Args:
             folder_relative_path: Path relative to trajectories/ directory
             model_relative_path: Path relative to models/ directory
@@ -315,6 +697,8 @@ class ThumbnailGenerator:
             azimuth: Horizontal rotation angle in degrees (used if camera_name not provided)
             elevation: Vertical rotation angle in degrees (used if camera_name not provided)
             lookat: Point to look at [x, y, z] (used if camera_name not provided)
+            jobs: Number of worker processes (1 renders sequentially in this process)
+            egl_devices: EGL device IDs to spread workers across (default: MUJOCO_EGL_DEVICE_ID)
 
         Returns:
             Tuple of (success_count, total_count)
@@ -330,7 +714,7 @@ class ThumbnailGenerator:
             return (0, 0)
 
         # Find all trajectory files in the folder
-        trajectory_files = list(folder_path.glob("*.npy")) + list(folder_path.glob("*.npz"))
+        trajectory_files = find_files(folder_path, TRAJECTORY_EXTENSIONS)
 
         if not trajectory_files:
             print(f"Warning: No trajectory files (.npy/.npz) found in {folder_path}")
@@ -339,75 +723,420 @@ class ThumbnailGenerator:
         print(f"Found {len(trajectory_files)} trajectory file(s) in {folder_relative_path}")
         print()
 
-        success_count = 0
         total_count = len(trajectory_files)
+        camera_args = (camera_name, distance, azimuth, elevation, lookat)
 
-        for trajectory_file in trajectory_files:
-            if self.render_trajectory(trajectory_file, model_relative_path, camera_name, distance, azimuth, elevation, lookat):
-                success_count += 1
-            print()  # Blank line between trajectories
+        # Up-to-date animations count as successes without loading the model at all
+        stale = self.stale_trajectories(trajectory_files, model_relative_path, camera_args)
+        success_count = total_count - len(stale)
+        if not stale:
+            return (success_count, total_count)
 
+        success_count += self._render_stale_trajectories(stale, model_relative_path, camera_args, jobs, egl_devices)
         return (success_count, total_count)
 
+    def _render_stale_trajectories(
+        self,
+        stale: List[Tuple[Path, Optional[str]]],
+        model_relative_path: str,
+        camera_args: tuple,
+        jobs: int = 1,
+        egl_devices: List[str] = None
+    ) -> int:
+        """Render trajectories returned by stale_trajectories with one model
 
-def main():
-    parser = argparse.ArgumentParser(
-        description="Generate thumbnails for motion library (models and trajectories)",
-        formatter_class=argparse.RawDescriptionHelpFormatter
+        The model, renderer and camera are loaded once (once per worker process when
+        jobs > 1) and reused for every trajectory, so callers should pass everything
+        they need rendered in a single call.
+
+        Returns:
+            Number of trajectories rendered successfully
+        """
+        jobs = min(jobs, len(stale))
+
+        if jobs <= 1:
+            try:
+                ctx = self.load_render_context(model_relative_path, *camera_args)
+            except Exception as e:
+                print(f"Error: {e}")
+                return 0
+
+            if ctx is None:
+                return 0
+
+            success_count = 0
+            model, data, renderer, camera = ctx
+            try:
+                for trajectory_file, signature in stale:
+                    if self._render_trajectory_with_ctx(
+                        model, data, renderer, camera, trajectory_file, model_relative_path, signature
+                    ):
+                        success_count += 1
+                    print()  # Blank line between trajectories
+            finally:
+                renderer.close()
+
+            return success_count
+
+        # Trajectories are independent, so render them concurrently. Each worker builds
+        # its own ThumbnailGenerator and render context (MjModel/MjData/GL contexts
+        # can't be pickled) once, then reuses it for every file it is handed.
+        # Workers are spawned, not forked: this process may already hold an EGL display
+        # (e.g. after rendering models in --all mode), and EGL/GL drivers aren't fork-safe
+        print(f"Rendering with {jobs} worker processes")
+        mp_context = multiprocessing.get_context("spawn")
+        device_counter = mp_context.Value("i", 0)
+
+        with ProcessPoolExecutor(
+            max_workers=jobs,
+            mp_context=mp_context,
+            initializer=_init_render_worker,
+            initargs=(device_counter, egl_devices or [], self._worker_generator_kwargs(), model_relative_path, camera_args)
+        ) as executor:
+            return sum(executor.map(_render_one, *zip(*stale)))
+
+    def _worker_generator_kwargs(self) -> dict:
+        """Settings for the ThumbnailGenerator each pool worker builds (staleness is checked up front)"""
+        return {
+            "data_dir": self.data_dir,
+            "size": self.size,
+            "webp_quality": self.webp_quality,
+            "webp_method": self.webp_method,
+            "optimize_size": self.optimize_size,
+        }
+
+    def find_model_files(self) -> List[str]:
+        """Find main model XML files, relative to models/
+
+        Same rule as the backend's model listing: XML files directly inside a model
+        directory (e.g., MS-Human-700/MS-Human-700-MJX.xml) or directly in models/.
+        """
+        model_files = find_files(self.models_dir, (MODEL_EXTENSION,)) + find_files(self.models_dir, (MODEL_EXTENSION,), "*/*")
+        return sorted(str(path.relative_to(self.models_dir)) for path in model_files)
+
+    def generate_all_models(self) -> Tuple[int, int]:
+        """Render thumbnails for every model with the default camera
+
+        Returns:
+            Tuple of (success_count, total_count)
+        """
+        model_files = self.find_model_files()
+        print(f"Found {len(model_files)} model(s)")
+        print()
+
+        success_count = 0
+        for model_file in model_files:
+            if self.render_model(model_file):
+                success_count += 1
+            print()  # Blank line between models
+
+        return (success_count, len(model_files))
+
+    def generate_all_trajectories(
+        self,
+        model_relative_path: str,
+        jobs: int = DEFAULT_JOBS,
+        egl_devices: List[str] = None
+    ) -> Tuple[int, int]:
+        """Render animations for every trajectory with one model and the default camera
+
+        Stale trajectories from all folders are rendered together, so the model and
+        renderer (or the worker pool) are set up once for the whole run.
+
+        Returns:
+            Tuple of (success_count, total_count)
+        """
+        trajectory_files = find_files(self.trajectories_dir, TRAJECTORY_EXTENSIONS, "**/*")
+        print(f"Found {len(trajectory_files)} trajectory file(s)")
+        print()
+
+        camera_args = (None, None, None, None, None)
+        stale = self.stale_trajectories(trajectory_files, model_relative_path, camera_args)
+        success_count = len(trajectory_files) - len(stale)
+        if stale:
+            success_count += self._render_stale_trajectories(stale, model_relative_path, camera_args, jobs, egl_devices)
+
+        return (success_count, len(trajectory_files))
+
+
+# Per-process state of pool workers, set up by _init_render_worker
+_worker_generator: Optional[ThumbnailGenerator] = None
+_worker_ctx = None
+_worker_model_relative_path: Optional[str] = None
+
+
+def _init_render_worker(
+    device_counter,
+    egl_devices: List[str],
+    generator_kwargs: dict,
+    model_relative_path: str,
+    camera_args: tuple
+):
+    """Pin a pool worker to an EGL device and load its render context
+
+    Devices are assigned round-robin across egl_devices. Workers are spawned fresh
+    processes that create their EGL display lazily on the first render, so setting
+    MUJOCO_EGL_DEVICE_ID here takes effect.
+    """
+    global _worker_generator, _worker_ctx, _worker_model_relative_path
+
+    if egl_devices:
+        with device_counter.get_lock():
+            worker_index = device_counter.value
+            device_counter.value += 1
+
+        os.environ["MUJOCO_EGL_DEVICE_ID"] = egl_devices[worker_index % len(egl_devices)]
+
+    _worker_generator = ThumbnailGenerator(**generator_kwargs)
+    _worker_model_relative_path = model_relative_path
+    try:
+        _worker_ctx = _worker_generator.load_render_context(model_relative_path, *camera_args)
+    except Exception as e:
+        # Raising here would break the whole pool; fail each file instead
+        print(f"Error: {e}")
+        _worker_ctx = None
+
+
+def _render_one(trajectory_path: Path, signature: Optional[str]) -> bool:
+    """Render one trajectory in a pool worker with the worker's render context"""
+    if _worker_ctx is None:
+        return False
+
+    model, data, renderer, camera = _worker_ctx
+    success = _worker_generator._render_trajectory_with_ctx(
+        model, data, renderer, camera, trajectory_path, _worker_model_relative_path, signature
     )
+    print()  # Blank line between trajectories
+    return success
 
-    parser.add_argument("--data-dir", default="./data", help="Data directory path (default: ../data)")
 
-    subparsers = parser.add_subparsers(dest="command", help="Command to execute")
+class RenderDaemon:
+    """Serve render requests over a Unix socket, keeping GL contexts and models hot
 
-    # render-model subcommand
-    model_parser = subparsers.add_parser(
-        "render-model",
-        help="Render thumbnail for ONE specific model",
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
-Examples:
-  # Render a model with default camera parameters
-  python scripts/generate_thumbnails.py render-model --model "MS-Human-700/MS-Human-700-MJX.xml"
+    Each CLI invocation pays for GL context creation and model compilation/upload.
+    The daemon keeps one compiled model and Renderer per (model, size) alive across
+    requests, so a batch regeneration pays those costs once per model (and again only
+    when the model's XML is edited).
 
-  # Render using a camera defined in the XML
-  python scripts/generate_thumbnails.py render-model --model "MS-Human-700/MS-Human-700-MJX.xml" --camera "cam1"
+    Protocol (one request per connection): the client sends a single JSON line
+        {"cmd": "render-model" | "render-trajectory", "model": "<path under models/>",
+         "trajectory": "<path under trajectories/>", "camera": {camera_name, distance, ...}}
+    and receives a JSON header line {"ok": true, "path": "...", "bytes": N} followed by
+    N bytes of WebP, or {"ok": false, "error": "..."}.
+    """
 
-  # Render with custom camera settings
-  python scripts/generate_thumbnails.py render-model --model "MS-Human-700/MS-Human-700-MJX.xml" --distance 5.0 --azimuth 90 --elevation -30
+    def __init__(self, generator: ThumbnailGenerator):
+        self.generator = generator
+        # (model path, size) -> ((mtime_ns, file size), (model, data, renderer))
+        self._contexts = OrderedDict()
+
+    def _get_context(self, model_relative_path: str, size: int) -> Tuple[mujoco.MjModel, mujoco.MjData, mujoco.Renderer]:
+        """Get (or create) the model, data and renderer for a model at a size, LRU-evicting old ones
+
+        A context is only reused while the XML's mtime and size are unchanged; an edited
+        model is recompiled, so thumbnails match the signature written next to them.
         """
+        model_path = self.generator.models_dir / model_relative_path
+        if not model_path.is_file() or model_path.suffix.lower() != MODEL_EXTENSION:
+            raise ValueError(f"Model not found or not an XML file: {model_relative_path}")
+
+        stat = model_path.stat()
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        key = (model_relative_path, size)
+        if key in self._contexts:
+            cached_stamp, ctx = self._contexts[key]
+            if cached_stamp == stamp:
+                self._contexts.move_to_end(key)
+                return ctx
+            # The XML changed on disk since it was compiled
+            del self._contexts[key]
+            ctx[2].close()
+
+        # Not _load_model: its cache is keyed on the path alone and would hand back the old model
+        model = mujoco.MjModel.from_xml_path(str(model_path))
+        ctx = (model, mujoco.MjData(model), mujoco.Renderer(model, size, size))
+        self._contexts[key] = (stamp, ctx)
+
+        if len(self._contexts) > DAEMON_MAX_RENDERERS:
+            _, (_, (_, _, evicted_renderer)) = self._contexts.popitem(last=False)
+            evicted_renderer.close()
+
+        return ctx
+
+    def handle(self, request: dict) -> Path:
+        """Render one request and return the path of the resulting thumbnail"""
+        generator = self.generator
+        model_relative_path = request.get("model")
+        if not model_relative_path:
+            raise ValueError("Request is missing 'model'")
+
+        camera = request.get("camera") or {}
+        camera_args = (
+            camera.get("camera_name"),
+            camera.get("distance"),
+            camera.get("azimuth"),
+            camera.get("elevation"),
+            camera.get("lookat")
+        )
+        cmd = request.get("cmd")
+
+        if cmd == "render-model":
+            output_path = generator.model_output_path(model_relative_path)
+            signature = generator.model_signature(model_relative_path, camera_args)
+            if not generator.is_up_to_date(output_path, signature):
+                print(f"Rendering model: {model_relative_path}")
+                model, data, renderer = self._get_context(model_relative_path, generator.size or MODEL_THUMBNAIL_SIZE)
+                render_camera = generator.build_camera(model, *camera_args)
+                generator._render_model_with_ctx(model, data, renderer, render_camera, output_path, signature)
+            return output_path
+
+        if cmd == "render-trajectory":
+            trajectory_path = generator.trajectories_dir / request.get("trajectory", "")
+            if not trajectory_path.is_file():
+                raise ValueError(f"Trajectory file not found: {request.get('trajectory')}")
+
+            _, _, output_path = generator.trajectory_output_path(trajectory_path)
+            stale = generator.stale_trajectories([trajectory_path], model_relative_path, camera_args)
+            if stale:
+                model, data, renderer = self._get_context(model_relative_path, generator.size or TRAJECTORY_THUMBNAIL_SIZE)
+                render_camera = generator.build_camera(model, *camera_args)
+                if not generator._render_trajectory_with_ctx(
+                    model, data, renderer, render_camera, trajectory_path, model_relative_path, stale[0][1]
+                ):
+                    raise RuntimeError("Failed to render trajectory (see daemon output)")
+            return output_path
+
+        raise ValueError(f"Unknown command: {cmd!r}")
+
+    def serve(self, socket_path: str):
+        """Serve requests until interrupted, one at a time (renderers aren't thread-safe)"""
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                try:
+                    request = json.loads(self.rfile.readline())
+                    output_path = daemon.handle(request)
+                    payload = output_path.read_bytes()
+                    header = {
+                        "ok": True,
+                        "path": str(output_path.relative_to(daemon.generator.data_dir)),
+                        "bytes": len(payload)
+                    }
+                except Exception as e:
+                    print(f"Error: {e}")
+                    self.wfile.write(json.dumps({"ok": False, "error": str(e)}).encode() + b"\n")
+                    return
+
+                self.wfile.write(json.dumps(header).encode() + b"\n")
+                self.wfile.write(payload)
+
+        # Remove a stale socket left behind by a daemon that didn't shut down cleanly,
+        # but never take over the socket of one that is still running
+        if os.path.exists(socket_path):
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+                if probe.connect_ex(socket_path) == 0:
+                    print(f"Error: A render daemon is already listening on {socket_path}")
+                    return
+            os.unlink(socket_path)
+
+        try:
+            with socketserver.UnixStreamServer(socket_path, Handler) as server:
+                os.chmod(socket_path, 0o600)
+                print(f"Render daemon listening on {socket_path}")
+                server.serve_forever()
+        except KeyboardInterrupt:
+            print("\nShutting down render daemon")
+        finally:
+            for _, (_, _, renderer) in self._contexts.values():
+                renderer.close()
+            self._contexts.clear()
+            if os.path.exists(socket_path):
+                os.unlink(socket_path)
+
+
+def render_client(socket_path: str, request: dict, output: Optional[str] = None) -> bool:
+    """Send one request to a running render daemon
+
+    Args:
+        socket_path: Daemon socket path
+        request: Request dict (see RenderDaemon)
+        output: File to write the returned WebP to ('-' for stdout, None to discard)
+
+    Returns:
+        True if successful, False otherwise
+    """
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(socket_path)
+            with sock.makefile("rwb") as stream:
+                stream.write(json.dumps(request).encode() + b"\n")
+                stream.flush()
+
+                header = json.loads(stream.readline())
+                if not header.get("ok"):
+                    print(f"Error: {header.get('error')}", file=sys.stderr)
+                    return False
+
+                payload = stream.read(header["bytes"])
+    except (OSError, ValueError) as e:
+        print(f"Error: Could not talk to render daemon at {socket_path}: {e}", file=sys.stderr)
+        return False
+
+    if output == "-":
+        sys.stdout.buffer.write(payload)
+        sys.stdout.buffer.flush()
+    elif output:
+        Path(output).write_bytes(payload)
+
+    print(f"Rendered {header['path']} ({header['bytes']} bytes)", file=sys.stderr)
+    return True
+
+
+def add_parallel_arguments(parser: argparse.ArgumentParser, jobs_default=DEFAULT_JOBS, devices_default=None):
+    """Add the --jobs/--egl-devices options for rendering many trajectories"""
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=jobs_default,
+        help="Worker processes when rendering a folder or --all/--trajectories; 1 renders sequentially (default: half the CPU cores)"
     )
-    model_parser.add_argument(
-        "--model",
-        required=True,
-        metavar="PATH",
-        help="Model path relative to models/ directory (e.g., 'MS-Human-700/MS-Human-700-MJX.xml')"
+    parser.add_argument(
+        "--egl-devices",
+        type=lambda value: [device.strip() for device in value.split(",") if device.strip()],
+        default=devices_default,
+        metavar="IDS",
+        help="Comma-separated EGL device IDs to assign workers to round-robin (e.g., '0,1')"
     )
-    model_parser.add_argument(
+
+
+def add_camera_arguments(subparser: argparse.ArgumentParser):
+    """Add the camera options shared by the render subcommands"""
+    subparser.add_argument(
         "--camera",
         type=str,
         default=None,
         help="Camera name defined in XML (if not specified, uses custom camera parameters below)"
     )
-    model_parser.add_argument(
+    subparser.add_argument(
         "--distance",
         type=float,
         default=None,
         help=f"Camera distance from model (default: {DEFAULT_CAMERA_DISTANCE}, ignored if --camera specified)"
     )
-    model_parser.add_argument(
+    subparser.add_argument(
         "--azimuth",
         type=float,
         default=None,
         help=f"Camera azimuth angle in degrees (default: {DEFAULT_CAMERA_AZIMUTH}, ignored if --camera specified)"
     )
-    model_parser.add_argument(
+    subparser.add_argument(
         "--elevation",
         type=float,
         default=None,
         help=f"Camera elevation angle in degrees (default: {DEFAULT_CAMERA_ELEVATION}, ignored if --camera specified)"
     )
-    model_parser.add_argument(
+    subparser.add_argument(
         "--lookat",
         type=float,
         nargs=3,
@@ -416,6 +1145,109 @@ Examples:
         help=f"Camera lookat point [x y z] (default: {DEFAULT_CAMERA_LOOKAT}, ignored if --camera specified)"
     )
 
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Generate thumbnails for motion library (models and trajectories)",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Render thumbnails for all models and all trajectories
+  python scripts/generate_thumbnails.py --all
+
+  # Render all trajectory animations with a specific model
+  python scripts/generate_thumbnails.py --trajectories --use-model "MS-Human-700/MS-Human-700-MJX.xml"
+
+  # Render everything sequentially, or with 8 workers spread across two GPUs
+  python scripts/generate_thumbnails.py --all --jobs 1
+  python scripts/generate_thumbnails.py --all --jobs 8 --egl-devices 0,1
+
+  # Per-command help (camera options, folders, parallelism)
+  python scripts/generate_thumbnails.py render-model --help
+  python scripts/generate_thumbnails.py render-trajectory --help
+        """
+    )
+
+    parser.add_argument("--data-dir", default="./data", help="Data directory path (default: ../data)")
+
+    # Batch modes (alternative to the subcommands below, using the default camera)
+    batch_group = parser.add_mutually_exclusive_group()
+    batch_group.add_argument("--all", action="store_true", help="Render thumbnails for all models and trajectories")
+    batch_group.add_argument("--models", action="store_true", help="Render thumbnails for all models")
+    batch_group.add_argument("--trajectories", action="store_true", help="Render animations for all trajectories")
+    parser.add_argument(
+        "--use-model",
+        metavar="PATH",
+        default=None,
+        help="Model to render trajectories with in --all/--trajectories mode (default: first model found)"
+    )
+    add_parallel_arguments(parser)
+    parser.add_argument(
+        "--size",
+        type=int,
+        default=None,
+        metavar="PIXELS",
+        help=f"Square thumbnail size to render at (default: {MODEL_THUMBNAIL_SIZE} for models, {TRAJECTORY_THUMBNAIL_SIZE} for trajectories)"
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Re-render thumbnails even if their inputs are unchanged since the last render"
+    )
+    parser.add_argument(
+        "--webp-quality",
+        type=int,
+        default=WEBP_QUALITY,
+        metavar="0-100",
+        help=f"Lossy WebP quality (default: {WEBP_QUALITY})"
+    )
+    parser.add_argument(
+        "--webp-method",
+        type=int,
+        choices=range(7),
+        default=WEBP_METHOD,
+        metavar="0-6",
+        help=f"WebP encoder effort, 0 = fastest ... 6 = smallest (default: {WEBP_METHOD})"
+    )
+    parser.add_argument(
+        "--optimize-size",
+        action="store_true",
+        help="Minimize animated WebP size (much slower encode)"
+    )
+    parser.add_argument(
+        "--gl-backend",
+        choices=GL_BACKENDS,
+        default=None,
+        help="MuJoCo OpenGL backend (default: $MUJOCO_GL, or egl on Linux if unset)"
+    )
+
+    subparsers = parser.add_subparsers(dest="command", help="Command to execute")
+
+    # render-model subcommand
+    model_parser = subparsers.add_parser(
+        "render-model",
+        help="Render thumbnail for ONE specific model",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Render a model with default camera parameters
+  python scripts/generate_thumbnails.py render-model --model "MS-Human-700/MS-Human-700-MJX.xml"
+
+  # Render using a camera defined in the XML
+  python scripts/generate_thumbnails.py render-model --model "MS-Human-700/MS-Human-700-MJX.xml" --camera "cam1"
+
+  # Render with custom camera settings
+  python scripts/generate_thumbnails.py render-model --model "MS-Human-700/MS-Human-700-MJX.xml" --distance 5.0 --azimuth 90 --elevation -30
+        """
+    )
+    model_parser.add_argument(
+        "--model",
+        required=True,
+        metavar="PATH",
+        help="Model path relative to models/ directory (e.g., 'MS-Human-700/MS-Human-700-MJX.xml')"
+    )
+    add_camera_arguments(model_parser)
+
     # render-trajectory subcommand
     trajectory_parser = subparsers.add_parser(
         "render-trajectory",
@@ -429,6 +1261,9 @@ Examples:
   # Render all trajectories in a folder
   python scripts/generate_thumbnails.py render-trajectory --trajectory "locomotion/" --model "MS-Human-700/MS-Human-700-MJX.xml"
 
+  # Render a folder with 8 worker processes spread across two GPUs
+  python scripts/generate_thumbnails.py render-trajectory --trajectory "locomotion/" --model "MS-Human-700/MS-Human-700-MJX.xml" --jobs 8 --egl-devices 0,1
+
   # Render using a camera defined in the XML
   python scripts/generate_thumbnails.py render-trajectory --trajectory "locomotion/walk.npy" --model "MS-Human-700/MS-Human-700-MJX.xml" --camera "cam1"
 
@@ -448,46 +1283,102 @@ Examples:
         metavar="PATH",
         help="Model path relative to models/ directory (e.g., 'MS-Human-700/MS-Human-700-MJX.xml')"
     )
-    trajectory_parser.add_argument(
-        "--camera",
-        type=str,
-        default=None,
-        help="Camera name defined in XML (if not specified, uses custom camera parameters below)"
+    add_camera_arguments(trajectory_parser)
+
+    # Also accepted after the subcommand; SUPPRESS keeps the global values otherwise
+    add_parallel_arguments(trajectory_parser, jobs_default=argparse.SUPPRESS, devices_default=argparse.SUPPRESS)
+
+    # render-daemon subcommand
+    daemon_parser = subparsers.add_parser(
+        "render-daemon",
+        help="Serve render requests over a Unix socket, keeping GL contexts and models loaded",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Start the daemon (global options like --size/--force apply to every request)
+  python scripts/generate_thumbnails.py render-daemon
+
+  # Then send it requests from other processes
+  python scripts/generate_thumbnails.py render-client --model "MS-Human-700/MS-Human-700-MJX.xml"
+        """
     )
-    trajectory_parser.add_argument(
-        "--distance",
-        type=float,
-        default=None,
-        help=f"Camera distance from model (default: {DEFAULT_CAMERA_DISTANCE}, ignored if --camera specified)"
+    daemon_parser.add_argument(
+        "--socket",
+        default=DAEMON_SOCKET_PATH,
+        metavar="PATH",
+        help=f"Unix socket path to listen on (default: {DAEMON_SOCKET_PATH})"
     )
-    trajectory_parser.add_argument(
-        "--azimuth",
-        type=float,
-        default=None,
-        help=f"Camera azimuth angle in degrees (default: {DEFAULT_CAMERA_AZIMUTH}, ignored if --camera specified)"
+
+    # render-client subcommand
+    client_parser = subparsers.add_parser(
+        "render-client",
+        help="Send a model or trajectory render request to a running render-daemon",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Render a model thumbnail through the daemon
+  python scripts/generate_thumbnails.py render-client --model "MS-Human-700/MS-Human-700-MJX.xml"
+
+  # Render a trajectory animation and also write the WebP bytes to a file
+  python scripts/generate_thumbnails.py render-client --trajectory "locomotion/walk.npy" --model "MS-Human-700/MS-Human-700-MJX.xml" --output walk.webp
+        """
     )
-    trajectory_parser.add_argument(
-        "--elevation",
-        type=float,
+    client_parser.add_argument(
+        "--model",
+        required=True,
+        metavar="PATH",
+        help="Model path relative to models/ directory (e.g., 'MS-Human-700/MS-Human-700-MJX.xml')"
+    )
+    client_parser.add_argument(
+        "--trajectory",
         default=None,
-        help=f"Camera elevation angle in degrees (default: {DEFAULT_CAMERA_ELEVATION}, ignored if --camera specified)"
+        metavar="PATH",
+        help="Trajectory file relative to trajectories/ directory (if omitted, renders the model thumbnail)"
     )
-    trajectory_parser.add_argument(
-        "--lookat",
-        type=float,
-        nargs=3,
-        metavar=("X", "Y", "Z"),
+    add_camera_arguments(client_parser)
+    client_parser.add_argument(
+        "--output",
         default=None,
-        help=f"Camera lookat point [x y z] (default: {DEFAULT_CAMERA_LOOKAT}, ignored if --camera specified)"
+        metavar="FILE",
+        help="Also write the returned WebP to FILE ('-' for stdout)"
+    )
+    client_parser.add_argument(
+        "--socket",
+        default=DAEMON_SOCKET_PATH,
+        metavar="PATH",
+        help=f"Unix socket path of the daemon (default: {DAEMON_SOCKET_PATH})"
     )
 
     args = parser.parse_args()
 
+    batch_mode = args.all or args.models or args.trajectories
+
     # Show help if no command specified
-    if not args.command:
+    if not args.command and not batch_mode:
         parser.print_help()
         return
 
+    if args.command and batch_mode:
+        parser.error("--all/--models/--trajectories can't be combined with a subcommand")
+
+    if args.command == "render-client":
+        # The daemon owns the data directory and GL context; just forward the request
+        request = {
+            "cmd": "render-trajectory" if args.trajectory else "render-model",
+            "model": args.model,
+            "trajectory": args.trajectory,
+            "camera": {
+                "camera_name": args.camera,
+                "distance": args.distance,
+                "azimuth": args.azimuth,
+                "elevation": args.elevation,
+                "lookat": args.lookat,
+            },
+        }
+        if not render_client(args.socket, request, args.output):
+            sys.exit(1)
+        return
+
     data_dir = Path(args.data_dir).resolve()
 
     if not data_dir.exists():
@@ -496,9 +1387,54 @@ Examples:
         print(f"Make sure you're running from the backend/ directory")
         return
 
-    generator = ThumbnailGenerator(data_dir)
+    if args.size is not None and args.size <= 0:
+        print(f"Error: --size must be a positive number of pixels, got {args.size}")
+        return
 
-    if args.command == "render-model":
+    if not 0 <= args.webp_quality <= 100:
+        print(f"Error: --webp-quality must be between 0 and 100, got {args.webp_quality}")
+        return
+
+    gl_backend = os.environ.get("MUJOCO_GL")
+    if gl_backend == "egl":
+        print(f"Using GL backend: egl (device {os.environ['MUJOCO_EGL_DEVICE_ID']})")
+    else:
+        print(f"Using GL backend: {gl_backend or 'MuJoCo default'}")
+
+    generator = ThumbnailGenerator(
+        data_dir,
+        args.size,
+        args.force,
+        webp_quality=args.webp_quality,
+        webp_method=args.webp_method,
+        optimize_size=args.optimize_size
+    )
+
+    if args.all or args.models:
+        success_count, total_count = generator.generate_all_models()
+        print(f"Completed: {success_count}/{total_count} model thumbnails generated successfully")
+        print()
+
+    if args.all or args.trajectories:
+        model_files = generator.find_model_files()
+        model_relative_path = args.use_model or (model_files[0] if model_files else None)
+
+        if model_relative_path is None:
+            print("Error: No model found for trajectory rendering")
+        else:
+            print(f"Rendering trajectories with model: {model_relative_path}")
+            print()
+            success_count, total_count = generator.generate_all_trajectories(
+                model_relative_path,
+                jobs=args.jobs,
+                egl_devices=args.egl_devices
+            )
+            print(f"Completed: {success_count}/{total_count} trajectory animations generated successfully")
+
+    if args.command == "render-daemon":
+        RenderDaemon(generator).serve(args.socket)
+
+    elif args.command == "render-model":
         # Render a single model
         success = generator.render_model(
             args.model,
@@ -542,7 +1478,9 @@ Examples:
                 distance=args.distance,
                 azimuth=args.azimuth,
                 elevation=args.elevation,
-                lookat=args.lookat
+                lookat=args.lookat,
+                jobs=args.jobs,
+                egl_devices=args.egl_devices
             )
             print(f"\nCompleted: {success_count}/{total_count} trajectory animations generated successfully")
 
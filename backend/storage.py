@@ -1,13 +1,29 @@
+import logging
 import os
+import re
+import shutil
+import uuid
 import numpy as np
 from pathlib import Path
 from datetime import datetime
-from typing import List, Optional, Tuple
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
 import hashlib
 from models import TrajectoryMetadata, ModelMetadata
 from config import settings
 
 
+logger = logging.getLogger(__name__)
+
+# Chunk size used when streaming uploads to disk
+UPLOAD_CHUNK_SIZE = 1 << 20  # 1 MiB
+
+# IDs produced by _get_file_id (first 16 hex digits of an MD5 digest)
+FILE_ID_PATTERN = re.compile(r'[0-9a-f]{16}')
+
+TRAJECTORY_EXTENSIONS = ('.npy', '.npz')
+THUMBNAIL_EXTENSIONS = ('.webp', '.png', '.jpg', '.gif')  # In order of preference
+
+
 class StorageManager:
     """Manages file system storage for trajectories and models."""
 
@@ -27,10 +43,29 @@ class StorageManager:
         """Generate a unique ID for a file."""
         return hashlib.md5(filename.encode()).hexdigest()[:16]
 
+    def _is_valid_id(self, item_id: str) -> bool:
+        """Check an ID's format so malformed IDs are rejected without touching disk."""
+        return FILE_ID_PATTERN.fullmatch(item_id) is not None
+
+    def _write_stream(self, file_path: Path, fileobj: BinaryIO) -> None:
+        """Stream a file-like object to disk in fixed-size chunks.
+
+        Data is written to a temporary file next to the destination and moved
+        into place once complete, so readers never observe a partial upload.
+        """
+        tmp_path = file_path.with_name(f".{file_path.name}.{uuid.uuid4().hex}.part")
+        try:
+            with open(tmp_path, 'wb') as dest:
+                shutil.copyfileobj(fileobj, dest, UPLOAD_CHUNK_SIZE)
+            os.replace(tmp_path, file_path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+
     def _parse_trajectory_file(self, file_path: Path) -> Tuple[Optional[int], Optional[float], Optional[int]]:
         """Parse NPY/NPZ file to extract metadata."""
         try:
-            if file_path.suffix == '.npz':
+            if file_path.suffix.lower() == '.npz':
                 data = np.load(file_path)
                 qpos = data.get('qpos_traj')
                 frame_rate = data.get('frame_rate', data.get('framerate'))
@@ -47,7 +82,7 @@ class StorageManager:
 
                 return frame_count, frame_rate, num_joints
 
-            elif file_path.suffix == '.npy':
+            elif file_path.suffix.lower() == '.npy':
                 data = np.load(file_path)
                 if len(data.shape) > 1:
                     frame_count = data.shape[0]
@@ -84,58 +119,94 @@ class StorageManager:
 
         return None
 
+    def _index_thumbnails(self, item_type: str) -> Dict[str, str]:
+        """Map item IDs to thumbnail paths with a single directory walk.
+
+        Used by the list endpoints instead of calling _find_thumbnail (several
+        recursive globs) once per item.
+
+        Args:
+            item_type: Either "models" or "trajectories"
+
+        Returns:
+            Dict of item ID to path relative to base_path
+        """
+        index = {}
+        rank = {}
+        for entry in self._scan_files(self.thumbnails_dir / item_type, THUMBNAIL_EXTENSIONS):
+            item_id, ext = os.path.splitext(entry.name)
+            priority = THUMBNAIL_EXTENSIONS.index(ext.lower())
+            if priority < rank.get(item_id, len(THUMBNAIL_EXTENSIONS)):
+                rank[item_id] = priority
+                index[item_id] = str(Path(entry.path).relative_to(self.base_path))
+        return index
+
+    def _scan_files(self, directory: Path, suffixes: Tuple[str, ...]) -> Iterator[os.DirEntry]:
+        """Recursively yield directory entries for files ending in one of suffixes.
+
+        Suffixes must be lowercase; file names are matched case-insensitively.
+
+        Uses os.scandir so callers can take the cached DirEntry.stat() result
+        instead of issuing a separate stat() per file.
+        """
+        pending = [directory]
+        while pending:
+            with os.scandir(pending.pop()) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(entry.path)
+                    elif entry.name.lower().endswith(suffixes) and entry.is_file():
+                        yield entry
+
     def list_trajectories(self, category: Optional[str] = None) -> List[TrajectoryMetadata]:
         """List all trajectory files."""
         trajectories = []
+        thumbnails = self._index_thumbnails("trajectories")
 
         # Walk through trajectories directory
-        for root, dirs, files in os.walk(self.trajectories_dir):
-            rel_path = Path(root).relative_to(self.trajectories_dir)
-            current_category = str(rel_path) if str(rel_path) != '.' else None
+        for entry in self._scan_files(self.trajectories_dir, TRAJECTORY_EXTENSIONS):
+            rel_path = Path(entry.path).relative_to(self.trajectories_dir)
+            current_category = str(rel_path.parent) if str(rel_path.parent) != '.' else None
 
             # Filter by category if specified
             if category and current_category != category:
                 continue
 
-            for filename in files:
-                if filename.endswith(('.npy', '.npz')):
-                    file_path = Path(root) / filename
-                    stat = file_path.stat()
-
-                    # Parse trajectory file
-                    frame_count, frame_rate, num_joints = self._parse_trajectory_file(file_path)
-
-                    # Get trajectory ID and check for thumbnail
-                    trajectory_id = self._get_file_id(str(file_path.relative_to(self.trajectories_dir)))
-                    thumbnail_path = self._find_thumbnail(trajectory_id, "trajectories")
-
-                    trajectories.append(TrajectoryMetadata(
-                        id=trajectory_id,
-                        filename=filename,
-                        category=current_category,
-                        file_size=stat.st_size,
-                        upload_date=datetime.fromtimestamp(stat.st_mtime),
-                        frame_count=frame_count,
-                        frame_rate=frame_rate,
-                        num_joints=num_joints,
-                        thumbnail_path=thumbnail_path
-                    ))
+            stat = entry.stat()
+
+            # Parse trajectory file
+            frame_count, frame_rate, num_joints = self._parse_trajectory_file(Path(entry.path))
+
+            # Get trajectory ID and look up thumbnail
+            trajectory_id = self._get_file_id(str(rel_path))
+
+            trajectories.append(TrajectoryMetadata(
+                id=trajectory_id,
+                filename=entry.name,
+                category=current_category,
+                file_size=stat.st_size,
+                upload_date=datetime.fromtimestamp(stat.st_mtime),
+                frame_count=frame_count,
+                frame_rate=frame_rate,
+                num_joints=num_joints,
+                thumbnail_path=thumbnails.get(trajectory_id)
+            ))
 
         return sorted(trajectories, key=lambda x: x.upload_date, reverse=True)
 
     def get_trajectory(self, trajectory_id: str) -> Optional[Path]:
         """Get trajectory file path by ID."""
-        for root, dirs, files in os.walk(self.trajectories_dir):
-            for filename in files:
-                if filename.endswith(('.npy', '.npz')):
-                    file_path = Path(root) / filename
-                    rel_path = file_path.relative_to(self.trajectories_dir)
-                    if self._get_file_id(str(rel_path)) == trajectory_id:
-                        return file_path
+        if not self._is_valid_id(trajectory_id):
+            return None
+        for entry in self._scan_files(self.trajectories_dir, TRAJECTORY_EXTENSIONS):
+            file_path = Path(entry.path)
+            rel_path = file_path.relative_to(self.trajectories_dir)
+            if self._get_file_id(str(rel_path)) == trajectory_id:
+                return file_path
         return None
 
-    def save_trajectory(self, filename: str, content: bytes, category: Optional[str] = None) -> TrajectoryMetadata:
-        """Save a trajectory file."""
+    def save_trajectory(self, filename: str, fileobj: BinaryIO, category: Optional[str] = None) -> TrajectoryMetadata:
+        """Save a trajectory file, streaming its content from a file-like object."""
         # Determine save location
         if category:
             save_dir = self.trajectories_dir / category
@@ -146,7 +217,7 @@ class StorageManager:
         file_path = save_dir / filename
 
         # Write file
-        file_path.write_bytes(content)
+        self._write_stream(file_path, fileobj)
 
         # Get metadata
         stat = file_path.stat()
@@ -176,72 +247,61 @@ class StorageManager:
             return True
         return False
 
+    def _scan_model_files(self) -> Iterator[Tuple[Optional[str], os.DirEntry]]:
+        """Yield (model_name, entry) for every main model XML file.
+
+        Main model files are XML files directly inside a model directory
+        (e.g., MS-Human-700/MS-Human-700-MJX.xml), or directly in models/ root
+        for backward compatibility, in which case model_name is None.
+        """
+        with os.scandir(self.models_dir) as it:
+            for item in it:
+                if item.is_dir():
+                    # This is a model directory (e.g., MS-Human-700)
+                    with os.scandir(item.path) as model_dir:
+                        for xml_file in model_dir:
+                            if xml_file.name.lower().endswith('.xml') and xml_file.is_file():
+                                yield item.name, xml_file
+                elif item.name.lower().endswith('.xml'):
+                    yield None, item
+
     def list_models(self) -> List[ModelMetadata]:
         """List main model files (excluding component files in subdirectories)."""
         models = []
+        thumbnails = self._index_thumbnails("models")
+
+        for model_name, entry in self._scan_model_files():
+            stat = entry.stat()
+            rel_path = Path(entry.path).relative_to(self.models_dir)
+
+            # Get model ID and look up thumbnail
+            model_id = self._get_file_id(str(rel_path))
 
-        # Scan for model directories and their main XML files
-        # Only include XML files that are direct children of model directories
-        for item in self.models_dir.iterdir():
-            if item.is_dir():
-                # This is a model directory (e.g., MS-Human-700)
-                model_dir = item
-
-                # Find XML files directly in this model directory (not in subdirs)
-                for xml_file in model_dir.glob('*.xml'):
-                    if xml_file.is_file():
-                        stat = xml_file.stat()
-                        rel_path = xml_file.relative_to(self.models_dir)
-
-                        # Get model ID and check for thumbnail
-                        model_id = self._get_file_id(str(rel_path))
-                        thumbnail_path = self._find_thumbnail(model_id, "models")
-
-                        models.append(ModelMetadata(
-                            id=model_id,
-                            filename=xml_file.name,
-                            model_name=model_dir.name,  # e.g., "MS-Human-700"
-                            relative_path=str(rel_path),
-                            file_size=stat.st_size,
-                            upload_date=datetime.fromtimestamp(stat.st_mtime),
-                            thumbnail_path=thumbnail_path
-                        ))
-            elif item.suffix == '.xml':
-                # XML file directly in models/ root (for backward compatibility)
-                stat = item.stat()
-
-                # Get model ID and check for thumbnail
-                model_id = self._get_file_id(item.name)
-                thumbnail_path = self._find_thumbnail(model_id, "models")
-
-                models.append(ModelMetadata(
-                    id=model_id,
-                    filename=item.name,
-                    model_name=None,
-                    relative_path=item.name,
-                    file_size=stat.st_size,
-                    upload_date=datetime.fromtimestamp(stat.st_mtime),
-                    thumbnail_path=thumbnail_path
-                ))
+            models.append(ModelMetadata(
+                id=model_id,
+                filename=entry.name,
+                model_name=model_name,  # e.g., "MS-Human-700"
+                relative_path=str(rel_path),
+                file_size=stat.st_size,
+                upload_date=datetime.fromtimestamp(stat.st_mtime),
+                thumbnail_path=thumbnails.get(model_id)
+            ))
 
         return sorted(models, key=lambda x: x.upload_date, reverse=True)
 
     def get_model(self, model_id: str) -> Optional[Path]:
         """Get model file path by ID."""
-        # Check model directories
-        for item in self.models_dir.iterdir():
-            if item.is_dir():
-                for xml_file in item.glob('*.xml'):
-                    rel_path = xml_file.relative_to(self.models_dir)
-                    if self._get_file_id(str(rel_path)) == model_id:
-                        return xml_file
-            elif item.suffix == '.xml':
-                if self._get_file_id(item.name) == model_id:
-                    return item
+        if not self._is_valid_id(model_id):
+            return None
+        for _, entry in self._scan_model_files():
+            file_path = Path(entry.path)
+            rel_path = file_path.relative_to(self.models_dir)
+            if self._get_file_id(str(rel_path)) == model_id:
+                return file_path
         return None
 
-    def save_model(self, filename: str, content: bytes, model_name: Optional[str] = None) -> ModelMetadata:
-        """Save a model file."""
+    def save_model(self, filename: str, fileobj: BinaryIO, model_name: Optional[str] = None) -> ModelMetadata:
+        """Save a model file, streaming its content from a file-like object."""
         if model_name:
             # Save in a model directory
             model_dir = self.models_dir / model_name
@@ -251,7 +311,7 @@ class StorageManager:
             # Save directly in models root
             file_path = self.models_dir / filename
 
-        file_path.write_bytes(content)
+        self._write_stream(file_path, fileobj)
         stat = file_path.stat()
         rel_path = file_path.relative_to(self.models_dir)
 
@@ -307,16 +367,17 @@ class StorageManager:
 
         # Construct absolute path
         requested_file = self.models_dir / file_relative_path
+        resolved_file = requested_file.resolve()
 
-        # Security check: ensure file is within models directory
+        # Security check: ensure file is within models directory (already resolved in __init__)
         try:
-            requested_file.resolve().relative_to(self.models_dir.resolve())
+            resolved_file.relative_to(self.models_dir)
         except ValueError:
             # Path is outside models directory
             return None
 
         # Check if file exists
-        if not requested_file.exists() or not requested_file.is_file():
+        if not requested_file.is_file():
             return None
 
         # Verify it's in the same model directory
@@ -328,7 +389,7 @@ class StorageManager:
             # Multi-file model - allow any file in the model directory
             model_dir = main_model_path.parent
             try:
-                requested_file.resolve().relative_to(model_dir.resolve())
+                resolved_file.relative_to(model_dir.resolve())
                 return requested_file
             except ValueError:
                 return None
@@ -344,23 +405,39 @@ class StorageManager:
         Returns:
             Path to thumbnail file if it exists, None otherwise
         """
-        print(f"[STORAGE] Looking for model thumbnail: model_id={model_id}")
+        if not self._is_valid_id(model_id):
+            return None
+
         thumbnail_dir = self.thumbnails_dir / "models"
-        print(f"[STORAGE] Search directory: {thumbnail_dir}")
-        print(f"[STORAGE] Directory exists: {thumbnail_dir.exists()}")
+        logger.debug("Looking for model thumbnail: model_id=%s in %s", model_id, thumbnail_dir)
 
         # Search recursively for thumbnail (thumbnails mirror directory structure)
         for ext in ['.webp', '.png', '.jpg', '.gif']:
             matches = list(thumbnail_dir.rglob(f"{model_id}{ext}"))
             if matches:
-                print(f"[STORAGE] Found {len(matches)} match(es) for {model_id}{ext}: {matches}")
+                logger.debug("Found %d match(es) for %s%s: %s", len(matches), model_id, ext, matches)
                 return matches[0]
-            else:
-                print(f"[STORAGE] No matches for pattern: {model_id}{ext}")
 
-        print(f"[STORAGE] Model thumbnail not found after checking all extensions")
+        logger.debug("Model thumbnail not found after checking all extensions")
         return None
 
+    def find_thumbnails(self, item_type: str, item_ids: List[str]) -> Dict[str, Path]:
+        """Get thumbnail paths for several items with a single directory walk.
+
+        Args:
+            item_type: Either "models" or "trajectories"
+            item_ids: IDs of the models or trajectories
+
+        Returns:
+            Dict of item ID to thumbnail path, for items that have a thumbnail
+        """
+        index = self._index_thumbnails(item_type)
+        return {
+            item_id: self.base_path / index[item_id]
+            for item_id in item_ids
+            if item_id in index
+        }
+
     def get_trajectory_thumbnail(self, trajectory_id: str) -> Optional[Path]:
         """Get thumbnail path for a trajectory by ID.
 
@@ -370,21 +447,20 @@ class StorageManager:
         Returns:
             Path to thumbnail file if it exists, None otherwise
         """
-        print(f"[STORAGE] Looking for trajectory thumbnail: trajectory_id={trajectory_id}")
+        if not self._is_valid_id(trajectory_id):
+            return None
+
         thumbnail_dir = self.thumbnails_dir / "trajectories"
-        print(f"[STORAGE] Search directory: {thumbnail_dir}")
-        print(f"[STORAGE] Directory exists: {thumbnail_dir.exists()}")
+        logger.debug("Looking for trajectory thumbnail: trajectory_id=%s in %s", trajectory_id, thumbnail_dir)
 
         # Search recursively for thumbnail (thumbnails mirror directory structure)
         for ext in ['.webp', '.png', '.jpg', '.gif']:
             matches = list(thumbnail_dir.rglob(f"{trajectory_id}{ext}"))
             if matches:
-                print(f"[STORAGE] Found {len(matches)} match(es) for {trajectory_id}{ext}: {matches}")
+                logger.debug("Found %d match(es) for %s%s: %s", len(matches), trajectory_id, ext, matches)
                 return matches[0]
-            else:
-                print(f"[STORAGE] No matches for pattern: {trajectory_id}{ext}")
 
-        print(f"[STORAGE] Trajectory thumbnail not found after checking all extensions")
+        logger.debug("Trajectory thumbnail not found after checking all extensions")
         return None
 
 
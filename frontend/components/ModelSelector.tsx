@@ -1,7 +1,7 @@
 'use client';
 
 import { useState, useEffect } from 'react';
-import { modelApi, ModelMetadata, API_BASE_URL } from '@/lib/api';
+import { modelApi, thumbnailApi, ModelMetadata, API_BASE_URL } from '@/lib/api';
 
 interface ModelSelectorProps {
   onModelSelect: (modelXML: string, model: ModelMetadata) => void;
@@ -31,17 +31,18 @@ export default function ModelSelector({ onModelSelect, selectedModelId }: ModelS
     const loadThumbnails = async () => {
       const urlMap = new Map<string, string>();
 
-      for (const model of models) {
-        if (model.thumbnail_path) {
-          try {
-            console.log('[MODEL SELECTOR] Preloading thumbnail for:', model.id, model.filename);
-            const blob = await modelApi.getThumbnail(model.id);
-            const blobUrl = URL.createObjectURL(blob);
-            urlMap.set(model.id, blobUrl);
-            console.log('[MODEL SELECTOR] Thumbnail preloaded:', model.id);
-          } catch (err) {
-            console.error('[MODEL SELECTOR] Failed to preload thumbnail:', model.id, err);
-          }
+      const refs = models
+        .filter(model => model.thumbnail_path)
+        .map(model => ({ type: 'model' as const, id: model.id }));
+
+      if (refs.length > 0) {
+        try {
+          console.log('[MODEL SELECTOR] Preloading thumbnails for', refs.length, 'model(s)');
+          const blobs = await thumbnailApi.getBatch(refs);
+          blobs.forEach((blob, id) => urlMap.set(id, URL.createObjectURL(blob)));
+          console.log('[MODEL SELECTOR] Thumbnails preloaded:', blobs.size);
+        } catch (err) {
+          console.error('[MODEL SELECTOR] Failed to preload thumbnails:', err);
         }
       }
 
@@ -1,7 +1,7 @@
 'use client';
 
 import { useState, useEffect } from 'react';
-import { trajectoryApi, TrajectoryMetadata } from '@/lib/api';
+import { trajectoryApi, thumbnailApi, TrajectoryMetadata } from '@/lib/api';
 
 interface TrajectorySelectorProps {
   onTrajectorySelect: (trajectoryData: Blob, trajectory: TrajectoryMetadata) => void;
@@ -113,17 +113,18 @@ export default function TrajectorySelector({
 
     const urlMap = new Map(thumbnailUrls);
 
-    for (const trajectory of categoryTrajectories) {
-      if (trajectory.thumbnail_path && !urlMap.has(trajectory.id)) {
-        try {
-          console.log('[TRAJECTORY SELECTOR] Preloading thumbnail for:', trajectory.id, trajectory.filename);
-          const blob = await trajectoryApi.getThumbnail(trajectory.id);
-          const blobUrl = URL.createObjectURL(blob);
-          urlMap.set(trajectory.id, blobUrl);
-          console.log('[TRAJECTORY SELECTOR] Thumbnail preloaded:', trajectory.id);
-        } catch (err) {
-          console.error('[TRAJECTORY SELECTOR] Failed to preload thumbnail:', trajectory.id, err);
-        }
+    const refs = categoryTrajectories
+      .filter(trajectory => trajectory.thumbnail_path && !urlMap.has(trajectory.id))
+      .map(trajectory => ({ type: 'trajectory' as const, id: trajectory.id }));
+
+    if (refs.length > 0) {
+      try {
+        console.log('[TRAJECTORY SELECTOR] Preloading thumbnails for', refs.length, 'trajectory(ies)');
+        const blobs = await thumbnailApi.getBatch(refs);
+        blobs.forEach((blob, id) => urlMap.set(id, URL.createObjectURL(blob)));
+        console.log('[TRAJECTORY SELECTOR] Thumbnails preloaded:', blobs.size);
+      } catch (err) {
+        console.error('[TRAJECTORY SELECTOR] Failed to preload thumbnails:', err);
       }
     }
 
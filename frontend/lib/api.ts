@@ -66,6 +66,43 @@ export interface ModelMetadata {
   thumbnail_path?: string;
 }
 
+export interface ThumbnailRef {
+  type: 'model' | 'trajectory';
+  id: string;
+}
+
+const THUMBNAIL_MEDIA_TYPES: Record<string, string> = {
+  webp: 'image/webp',
+  png: 'image/png',
+  jpg: 'image/jpeg',
+  gif: 'image/gif',
+};
+
+/**
+ * Extract files from an uncompressed USTAR archive.
+ * @returns Map of member name (e.g., "trajectory/abc123.webp") to file contents
+ */
+function parseTar(buffer: ArrayBuffer): Map<string, Blob> {
+  const bytes = new Uint8Array(buffer);
+  const decoder = new TextDecoder();
+  const readField = (start: number, length: number) =>
+    decoder.decode(bytes.subarray(start, start + length)).split('\0')[0].trim();
+
+  const files = new Map<string, Blob>();
+  let offset = 0;
+  while (offset + 512 <= bytes.length && bytes[offset] !== 0) {
+    const name = readField(offset, 100);
+    const size = parseInt(readField(offset + 124, 12), 8);
+    const start = offset + 512;
+    const extension = name.split('.').pop() ?? '';
+    files.set(name, new Blob([buffer.slice(start, start + size)], {
+      type: THUMBNAIL_MEDIA_TYPES[extension] ?? 'application/octet-stream',
+    }));
+    offset = start + Math.ceil(size / 512) * 512;
+  }
+  return files;
+}
+
 // Auth API
 export const authApi = {
   login: async (password: string): Promise<TokenResponse> => {
@@ -151,6 +188,14 @@ export const modelApi = {
     });
     return response.data;
   },
+  getStaticFile: async (filePath: string): Promise<Blob> => {
+    // Served by the backend's static mount, bypassing per-file API routing
+    const encodedPath = filePath.split('/').map(segment => encodeURIComponent(segment)).join('/');
+    const response = await api.get(`/api/models-static/${encodedPath}`, {
+      responseType: 'blob',
+    });
+    return response.data;
+  },
   getThumbnail: async (id: string): Promise<Blob> => {
     const response = await api.get(`/api/models/${id}/thumbnail`, {
       responseType: 'blob',
@@ -158,3 +203,20 @@ export const modelApi = {
     return response.data;
   },
 };
+
+// Thumbnail API
+export const thumbnailApi = {
+  // Fetch many thumbnails in one request; returns a map of item ID to image
+  getBatch: async (refs: ThumbnailRef[]): Promise<Map<string, Blob>> => {
+    const response = await api.post('/api/thumbnails:batch', refs, {
+      responseType: 'arraybuffer',
+    });
+    const thumbnails = new Map<string, Blob>();
+    parseTar(response.data).forEach((blob, name) => {
+      // Member names are "{type}/{id}.{ext}"
+      const id = name.slice(name.indexOf('/') + 1, name.lastIndexOf('.'));
+      thumbnails.set(id, blob);
+    });
+    return thumbnails;
+  },
+};
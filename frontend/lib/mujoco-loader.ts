@@ -180,7 +180,7 @@ export async function loadModelWithDependencies(
       } else {
         // Dependency file - fetch from backend
         try {
-          const fileBlob = await modelApi.getFile(modelId, filePath);
+          const fileBlob = await modelApi.getStaticFile(filePath);
           const fileContent = await fileBlob.arrayBuffer();
           writeFileToVFS(mujoco, `/working/${filePath}`, new Uint8Array(fileContent));
           console.log(`Loaded dependency: ${filePath}`);